@@ -1,11 +1,13 @@
 import requests
 from bs4 import BeautifulSoup
-import json
+import orjson
 import os
 from datetime import datetime
 import schedule
-import time
+import threading
 from dotenv import load_dotenv
+from utils.chunking import truncate_to_tokens
+from utils.fingerprints import FingerprintStore, content_fingerprint
 import mysql.connector
 from mysql.connector import Error
 import sys
@@ -38,6 +40,9 @@ class AIEnhancedCrawler:
         # Ensure database tables exist
         self.init_database()
         
+        # Content fingerprints of previously analysed pages
+        self.fingerprints = FingerprintStore()
+        
     def init_database(self):
         """Initialize database connection and ensure tables exist"""
         try:
@@ -74,7 +79,7 @@ class AIEnhancedCrawler:
             print(f"Error fetching {url}: {e}")
             return None
 
-    def parse_content(self, html_content, technology_area):
+    def parse_content(self, html_content, technology_area, url=None):
         """Parse HTML content using BeautifulSoup"""
         if not html_content:
             return None
@@ -85,9 +90,20 @@ class AIEnhancedCrawler:
         text_content = soup.get_text(strip=True)
         title = soup.title.string if soup.title else ''
         
+        # Skip the AI call if the page text is unchanged since the last run
+        fingerprint = content_fingerprint(text_content)
+        if url:
+            cached = self.fingerprints.lookup(url, technology_area, fingerprint)
+            if cached:
+                print(f"Content unchanged for {url}, reusing previous extraction")
+                return cached
+        
         # Use AI to analyze and extract structured information
         structured_data = self.analyze_with_ai(text_content, title, technology_area)
         
+        if url and structured_data and "error" not in structured_data.get("meta", {}):
+            self.fingerprints.record(url, technology_area, fingerprint, structured_data)
+        
         return structured_data
 
     def analyze_with_ai(self, text_content, title, technology_area):
@@ -98,7 +114,7 @@ class AIEnhancedCrawler:
             
             # Prepare data for the request
             data = {
-                "text": text_content[:3000],  # Limit text length
+                "text": truncate_to_tokens(text_content),  # Limit text length
                 "technology_area": technology_area
             }
             
@@ -325,7 +341,7 @@ class AIEnhancedCrawler:
         
         html_content = self.fetch_page(url)
         if html_content:
-            data = self.parse_content(html_content, technology_area)
+            data = self.parse_content(html_content, technology_area, url)
             if data:
                 self.save_to_database(data, url, technology_area)
                 return data
@@ -355,7 +371,7 @@ class AIEnhancedCrawler:
         """Use AI to consolidate findings from multiple sources"""
         try:
             # Convert results to a string representation for the prompt
-            results_str = json.dumps(results, indent=2)
+            results_str = orjson.dumps(results, option=orjson.OPT_INDENT_2).decode()
             
             prompt = f"""
             Consolidate the following research findings about {technology_area} from multiple sources:
@@ -395,6 +411,13 @@ class AIEnhancedCrawler:
                 "raw_results": results
             }
 
+def run_scheduler(stop_event):
+    """Run scheduled jobs until stop_event is set, waking exactly when the next job is due"""
+    while not stop_event.is_set():
+        schedule.run_pending()
+        idle = schedule.idle_seconds()
+        stop_event.wait(timeout=max(idle, 0) if idle is not None else 60)
+
 def main():
     # Initialize the AI-enhanced crawler
     crawler = AIEnhancedCrawler()
@@ -423,10 +446,16 @@ def main():
     # Run the crawler immediately if needed
     # crawl_job()
     
-    # Keep the script running
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    # Run the scheduler in the background and keep the script alive until
+    # interrupted, then let a running job finish before exiting
+    stop_event = threading.Event()
+    scheduler_thread = threading.Thread(target=run_scheduler, args=(stop_event,), daemon=True)
+    scheduler_thread.start()
+    try:
+        scheduler_thread.join()
+    except KeyboardInterrupt:
+        stop_event.set()
+        scheduler_thread.join()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,14 +1,37 @@
 import requests
 from bs4 import BeautifulSoup
-import json
+import orjson
 import os
 from datetime import datetime
 import time
+from urllib.parse import urlparse
 from dotenv import load_dotenv
+from utils.chunking import truncate_to_tokens
+from utils.fingerprints import FingerprintStore, content_fingerprint
 
 # Load environment variables
 load_dotenv()
 
+# Single-pass translation table for filename slugs
+_SLUG_TRANS = str.maketrans({' ': '_'})
+
+# Fields extracted for every technology development
+EXTRACTION_FIELDS = (
+    "Key Role Players",
+    "Technological Development",
+    "Project Cost",
+    "Date of Information Release",
+    "Event Location",
+    "Contact Information",
+)
+
+# JSON schema passed to Ollama's structured output ``format`` so responses are always valid JSON
+EXTRACTION_SCHEMA = {
+    "type": "object",
+    "properties": {field: {"type": "string"} for field in EXTRACTION_FIELDS},
+    "required": list(EXTRACTION_FIELDS),
+}
+
 class DirectPhiCrawler:
     def __init__(self):
         # Local Ollama endpoint
@@ -18,6 +41,9 @@ class DirectPhiCrawler:
         # Ensure data directory exists
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
+        
+        # Content fingerprints of previously analysed pages
+        self.fingerprints = FingerprintStore(os.path.join(self.data_dir, 'fingerprints.sqlite3'))
     
     def fetch_page(self, url):
         """Fetch a webpage and return its content"""
@@ -43,7 +69,7 @@ class DirectPhiCrawler:
             
             Title: {title}
             
-            Content: {text_content[:3000]}
+            Content: {truncate_to_tokens(text_content)}
             
             Extract and format the following information as JSON:
             1. Key Role Players: Identify individuals, organizations, or companies leading the development.
@@ -62,6 +88,7 @@ class DirectPhiCrawler:
                 "model": "phi3",
                 "prompt": prompt,
                 "stream": False,
+                "format": EXTRACTION_SCHEMA,
                 "options": {
                     "temperature": 0.1,
                     "top_p": 0.9
@@ -75,17 +102,8 @@ class DirectPhiCrawler:
             # Parse the response
             result = response.json()
             
-            # Try to extract JSON from the response
-            try:
-                json_data = json.loads(result['response'])
-            except json.JSONDecodeError:
-                # Try to extract JSON using regex if the response isn't pure JSON
-                import re
-                json_match = re.search(r'(\{.*\})', result['response'], re.DOTALL)
-                if json_match:
-                    json_data = json.loads(json_match.group(1))
-                else:
-                    raise Exception("Could not extract JSON from model response")
+            # The schema-constrained response is always a JSON object
+            json_data = orjson.loads(result['response'])
             
             # Add metadata
             json_data["meta"] = {
@@ -119,21 +137,16 @@ class DirectPhiCrawler:
     def consolidate_findings(self, results, technology_area):
         """Use Phi3 to consolidate findings from multiple sources"""
         try:
-            # Simplify results to avoid token limits
-            simplified_results = []
-            for result in results:
-                simplified = {
-                    "Key Role Players": result.get("Key Role Players", "Not found"),
-                    "Technological Development": result.get("Technological Development", "Not found"),
-                    "Project Cost": result.get("Project Cost", "Not found"),
-                    "Date of Information Release": result.get("Date of Information Release", "Not found"),
-                    "Event Location": result.get("Event Location", "Not found"),
-                    "Contact Information": result.get("Contact Information", "Not found"),
-                    "Source": result.get("meta", {}).get("source_title", "Unknown source")
-                }
-                simplified_results.append(simplified)
-            
-            results_str = json.dumps(simplified_results, indent=2)
+            # One compact JSON array per source (fields in header order) to keep the prompt small
+            header = orjson.dumps(list(EXTRACTION_FIELDS) + ["Source"]).decode()
+            rows = (
+                orjson.dumps(
+                    [result.get(field, "Not found") for field in EXTRACTION_FIELDS]
+                    + [result.get("meta", {}).get("source_title", "Unknown source")]
+                ).decode()
+                for result in results
+            )
+            results_str = "\n".join((header, *rows))
             
             # Prepare the prompt for consolidation
             prompt = f"""
@@ -141,7 +154,7 @@ class DirectPhiCrawler:
             
             Task: Analyze the following research findings about {technology_area} extracted from multiple sources.
             
-            Sources Data:
+            Sources Data (the first line lists the fields; each following line is one source's values in that order):
             {results_str}
             
             Create a comprehensive summary that reconciles any conflicts and provides the most accurate information about:
@@ -161,6 +174,7 @@ class DirectPhiCrawler:
                 "model": "phi3",
                 "prompt": prompt,
                 "stream": False,
+                "format": EXTRACTION_SCHEMA,
                 "options": {
                     "temperature": 0.1,
                     "top_p": 0.9
@@ -174,17 +188,8 @@ class DirectPhiCrawler:
             # Parse the response
             result = response.json()
             
-            # Try to extract JSON from the response
-            try:
-                consolidated = json.loads(result['response'])
-            except json.JSONDecodeError:
-                # Try to extract JSON using regex
-                import re
-                json_match = re.search(r'(\{.*\})', result['response'], re.DOTALL)
-                if json_match:
-                    consolidated = json.loads(json_match.group(1))
-                else:
-                    raise Exception("Could not extract JSON from model response")
+            # The schema-constrained response is always a JSON object
+            consolidated = orjson.loads(result['response'])
             
             # Add metadata
             consolidated["meta"] = {
@@ -208,8 +213,8 @@ class DirectPhiCrawler:
         """Save the data to a JSON file"""
         filepath = os.path.join(self.data_dir, filename)
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
             print(f"Data saved to {filepath}")
             return True
         except Exception as e:
@@ -221,8 +226,8 @@ class DirectPhiCrawler:
         print(f"Crawling {url} for information about {technology_area}...")
         
         # Generate filename based on URL and technology area
-        domain = url.replace('https://', '').replace('http://', '').split('/')[0]
-        safe_tech_name = technology_area.replace(' ', '_').lower()
+        domain = urlparse(url).hostname or url.split('/')[0]
+        safe_tech_name = technology_area.translate(_SLUG_TRANS).lower()
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         filename = f"{safe_tech_name}_{domain}_{timestamp}.json"
         
@@ -233,11 +238,20 @@ class DirectPhiCrawler:
             text_content = soup.get_text(strip=True)
             title = soup.title.string if soup.title else domain
             
+            # Skip the model call if the page text is unchanged since the last run
+            fingerprint = content_fingerprint(text_content)
+            cached = self.fingerprints.lookup(url, technology_area, fingerprint)
+            if cached:
+                print(f"Content unchanged for {url}, reusing previous extraction")
+                return cached
+            
             # Analyze with Phi3
             data = self.analyze_with_phi3(text_content, title, technology_area)
             if data:
                 # Save the data
                 self.save_data(data, filename)
+                if "error" not in data.get("meta", {}):
+                    self.fingerprints.record(url, technology_area, fingerprint, data)
                 return data
         
         return None
@@ -261,7 +275,7 @@ class DirectPhiCrawler:
             
             # Save consolidated findings
             if consolidated:
-                safe_tech_name = technology_area.replace(' ', '_').lower()
+                safe_tech_name = technology_area.translate(_SLUG_TRANS).lower()
                 timestamp = datetime.now().strftime("%Y%m%d")
                 filename = f"{safe_tech_name}_consolidated_{timestamp}.json"
                 self.save_data(consolidated, filename)
@@ -5,13 +5,14 @@ Uses Redis for coordination between nodes in the processing cluster.
 import os
 import json
 import logging
+import orjson
 import time
 import redis
 import uuid
 import socket
 import shutil
 import subprocess
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Tuple
 from datetime import datetime
 
 from dotenv import load_dotenv
@@ -29,6 +30,30 @@ logger = logging.getLogger("job_queue")
 _redis = redis.Redis.from_url(REDIS_URL)
 
 
+def _document_payload(path: str, meta: Optional[Dict[str, Any]]) -> bytes:
+    return orjson.dumps({"path": path, "meta": meta or {}, "submitted_at": time.time()})
+
+
+def enqueue_document(path: str, meta: Optional[Dict[str, Any]] = None) -> None:
+    """Push one saved document onto the ingestion queue (QUEUE_KEY)."""
+    _redis.lpush(QUEUE_KEY, _document_payload(path, meta))
+
+
+def enqueue_documents_bulk(items: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> int:
+    """Push many ``(path, meta)`` documents in a single Redis round-trip.
+
+    Returns the number of documents queued.
+    """
+    pipe = _redis.pipeline(transaction=False)
+    count = 0
+    for path, meta in items:
+        pipe.lpush(QUEUE_KEY, _document_payload(path, meta))
+        count += 1
+    if count:
+        pipe.execute()
+    return count
+
+
 class DistributedJobQueue:
     def __init__(self, redis_url="redis://localhost:6379/0", queue_name="document_queue", 
                  results_key="processing_results", worker_set="active_workers",
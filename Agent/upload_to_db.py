@@ -1,13 +1,41 @@
 import mysql.connector
 from mysql.connector import Error
-import json
+import orjson
 import os
 import glob
+import re
 from datetime import datetime
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Single-pass translation tables for filename <-> name <-> slug conversions
+_NAME_TRANS = str.maketrans({'_': ' '})
+_SLUG_TRANS = str.maketrans({' ': '-'})
+
+# Fallback for non-ISO dates such as 2024/3/5 before reaching for dateutil
+_DATE_RE = re.compile(r'(\d{4})[-/](\d{1,2})[-/](\d{1,2})')
+
+def parse_info_date(raw):
+    """Normalise a model-reported release date to YYYY-MM-DD, or None"""
+    if not isinstance(raw, str):
+        return None
+    try:
+        return datetime.fromisoformat(raw[:10]).strftime('%Y-%m-%d')
+    except ValueError:
+        pass
+    m = _DATE_RE.match(raw)
+    if m:
+        try:
+            return datetime(*map(int, m.groups())).strftime('%Y-%m-%d')
+        except ValueError:
+            pass
+    try:
+        from dateutil import parser
+        return parser.parse(raw).strftime('%Y-%m-%d')
+    except (ImportError, ValueError, OverflowError, TypeError):
+        return None
+
 def connect_to_database():
     """Connect to the cPanel MySQL database"""
     try:
@@ -37,12 +65,12 @@ def upload_consolidated_data():
     for file_path in consolidated_files:
         try:
             # Read JSON file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(file_path, 'rb') as f:
+                data = orjson.loads(f.read())
             
             # Extract technology area from filename
             filename = os.path.basename(file_path)
-            tech_area = filename.split('_consolidated_')[0].replace('_', ' ')
+            tech_area = filename.split('_consolidated_')[0].translate(_NAME_TRANS)
             
             # Check if technology area exists in database, create if not
             cursor.execute("SELECT id FROM technology_areas WHERE LOWER(name) = LOWER(%s)", (tech_area,))
@@ -52,7 +80,7 @@ def upload_consolidated_data():
                 tech_area_id = result[0]
             else:
                 # Create new technology area
-                tech_slug = tech_area.lower().replace(' ', '-')
+                tech_slug = tech_area.lower().translate(_SLUG_TRANS)
                 cursor.execute(
                     "INSERT INTO technology_areas (name, slug, description) VALUES (%s, %s, %s)",
                     (tech_area.title(), tech_slug, f"Information about {tech_area} in Hampton Roads")
@@ -62,11 +90,7 @@ def upload_consolidated_data():
             # Parse date if available
             info_date = None
             if data.get("Date of Information Release") and data["Date of Information Release"] != "Not found":
-                try:
-                    from dateutil import parser
-                    info_date = parser.parse(data["Date of Information Release"]).strftime('%Y-%m-%d')
-                except:
-                    info_date = None
+                info_date = parse_info_date(data["Date of Information Release"])
             
             # Check if consolidated entry already exists
             cursor.execute(
@@ -3,9 +3,52 @@
 Each chunk contains up to *chunk_size* words; sliding window overlap length *overlap*.
 
 Used by enhanced_document_processor to bypass context limits.
+
+``truncate_to_tokens`` caps crawler page text by an approximate token budget
+rather than a raw character slice.  It uses tiktoken when installed and falls
+back to a whitespace heuristic otherwise.
 """
+from functools import lru_cache
 from typing import List
 
+# Rough English averages used when no tokenizer is installed
+WORDS_PER_TOKEN = 0.75
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def truncate_to_tokens(text: str, max_tokens: int = 3000) -> str:
+    """Return the prefix of *text* that fits in roughly *max_tokens* tokens.
+
+    Args:
+        text: page or document text.
+        max_tokens: token budget for the text portion of the prompt.
+
+    Returns:
+        Truncated text (unchanged if already within budget).
+    """
+    enc = _get_encoding()
+    if enc is not None:
+        tokens = enc.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return enc.decode(tokens[:max_tokens])
+
+    max_words = int(max_tokens * WORDS_PER_TOKEN)
+    words = text.split(maxsplit=max_words)
+    if len(words) > max_words:
+        text = " ".join(words[:max_words])
+    # Guard against long unbroken runs (e.g. get_text(strip=True) output)
+    return text[:max_tokens * CHARS_PER_TOKEN]
+
 def chunk_document(text: str, chunk_size: int = 1500, overlap: int = 200, max_chunks: int = 5) -> List[str]:
     """Split *text* into a list of chunks with word overlap.
 
@@ -0,0 +1,70 @@
+"""Page-content fingerprints so crawlers can skip LLM calls on unchanged pages.
+
+Fingerprints are stored in a small SQLite table keyed by (url, technology_area)
+together with the extraction result that was produced for that content.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+import orjson
+
+DEFAULT_DB_PATH = os.getenv('FINGERPRINT_DB', os.path.join('data', 'fingerprints.sqlite3'))
+
+
+def content_fingerprint(text: str) -> str:
+    """Return a 128-bit BLAKE2b hex digest of *text*."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class FingerprintStore:
+    """SQLite-backed map of page URL -> last content fingerprint and result.
+
+    The connection may be used from any thread (e.g. the crawler's scheduler
+    thread); a lock serialises access to it.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS fingerprints (
+                   url TEXT NOT NULL,
+                   technology_area TEXT NOT NULL,
+                   fingerprint TEXT NOT NULL,
+                   result TEXT NOT NULL,
+                   updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                   PRIMARY KEY (url, technology_area)
+               )"""
+        )
+        self.conn.commit()
+
+    def lookup(self, url: str, technology_area: str, fingerprint: str) -> Optional[Dict]:
+        """Return the stored result if *fingerprint* matches the last run, else None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT fingerprint, result FROM fingerprints WHERE url = ? AND technology_area = ?",
+                (url, technology_area),
+            ).fetchone()
+        if row is None or row[0] != fingerprint:
+            return None
+        try:
+            return orjson.loads(row[1])
+        except orjson.JSONDecodeError:
+            return None
+
+    def record(self, url: str, technology_area: str, fingerprint: str, result: Dict) -> None:
+        """Store *result* as the extraction for this page content."""
+        payload = orjson.dumps(result).decode()
+        with self._lock:
+            self.conn.execute(
+                """INSERT OR REPLACE INTO fingerprints (url, technology_area, fingerprint, result, updated_at)
+                   VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)""",
+                (url, technology_area, fingerprint, payload),
+            )
+            self.conn.commit()
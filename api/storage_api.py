@@ -6,6 +6,7 @@ across the distributed storage network.
 
 import os
 import json
+import shutil
 import time
 from pathlib import Path
 from flask import Blueprint, request, jsonify, send_file, current_app
@@ -16,6 +17,9 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ipfs_storage.distributed_storage import DistributedStorage
 
+# Read size when streaming raw upload bodies to disk
+STREAM_CHUNK_SIZE = 1024 * 1024
+
 # Create blueprint
 storage_api = Blueprint('storage_api', __name__, url_prefix='/api/storage')
 
@@ -89,6 +93,22 @@ def storage_status():
 def store_file():
     """Store a file in the distributed storage system."""
     storage = get_storage()
+    temp_dir = Path(current_app.config.get('TEMP_DIR', '/tmp'))
+    temp_dir.mkdir(exist_ok=True)
+    
+    if request.mimetype == 'application/octet-stream':
+        # Raw-body upload (peer replication): metadata travels in headers
+        file_id = request.headers.get('X-File-Id')
+        replicate = request.headers.get('X-Replicate', 'true').lower() == 'true'
+        filename = secure_filename(request.headers.get('X-File-Name') or file_id or '')
+        if not filename:
+            return jsonify({"error": "Empty filename"}), 400
+        metadata = {}
+        
+        temp_path = temp_dir / f"{int(time.time())}_{filename}"
+        stream = request.stream
+        return _store_temp_file(storage, temp_path, lambda path: _save_stream(stream, path),
+                                file_id, metadata, replicate)
     
     if 'file' not in request.files:
         return jsonify({"error": "No file provided"}), 400
@@ -111,13 +131,23 @@ def store_file():
         
     # Save the file temporarily
     filename = secure_filename(file.filename)
-    temp_dir = Path(current_app.config.get('TEMP_DIR', '/tmp'))
-    temp_dir.mkdir(exist_ok=True)
     temp_path = temp_dir / f"{int(time.time())}_{filename}"
+    return _store_temp_file(storage, temp_path, file.save, file_id, metadata, replicate)
+
+def _save_stream(stream, path):
+    """Copy a raw request body to *path*."""
+    with open(path, 'wb') as f:
+        shutil.copyfileobj(stream, f, STREAM_CHUNK_SIZE)
+
+def _store_temp_file(storage, temp_path, write, file_id, metadata, replicate):
+    """Write an upload to *temp_path* with ``write(temp_path)``, store it, then remove it.
     
-    file.save(temp_path)
-    
+    The temp file is removed even if writing it fails part-way (e.g. the
+    client disconnects or the disk fills up).
+    """
     try:
+        write(temp_path)
+        
         # Store in distributed storage
         result = storage.store_file(temp_path, metadata, replicate)
         
@@ -3,9 +3,18 @@
 This module provides simple functions to detect mentions of Hampton Roads
 localities in document text and extract location information.
 """
+import hashlib
 import re
-from graph_db.schema import NodeType, EdgeType
+import sys
+from collections import OrderedDict
+from graph_db.schema import LOCATED_IN
 from datetime import datetime
+import threading
+
+try:
+    import hyperscan
+except ImportError:  # pragma: no cover - optional accelerator
+    hyperscan = None
 
 # Hampton Roads localities (used for locality detection)
 HAMPTON_ROADS_LOCALITIES = [
@@ -45,31 +54,163 @@ REGION_PATTERNS = [
     r"\bTidewater\b"
 ]
 
+# All locality variants fused into one alternation with a named group per
+# locality, so the regex path walks the text once.  Longer variants come first
+# so "York County" is a single mention rather than "York" plus "County".
+_GROUP_TO_LOCALITY = {
+    locality.replace(' ', '_'): locality for locality in LOCALITY_PATTERNS
+}
+_LOCALITY_RE = re.compile(
+    "|".join(
+        f"(?P<{group}>" + "|".join(sorted(LOCALITY_PATTERNS[locality], key=len, reverse=True)) + ")"
+        for group, locality in _GROUP_TO_LOCALITY.items()
+    ),
+    re.IGNORECASE,
+)
+_REGION_RE = re.compile("|".join(REGION_PATTERNS), re.IGNORECASE)
+
+
+def _build_hyperscan_db():
+    """Compile every locality variant into one Hyperscan block-mode database.
+
+    Returns ``(database, localities)`` where ``localities[i]`` is the locality
+    for expression id ``i``, or ``(None, ())`` if hyperscan is not installed.
+    Hyperscan's ``\\b`` only knows ASCII word characters, so the variants are
+    compiled without their anchors and ``_at_word_boundary`` checks each match
+    against the same Unicode word characters ``re`` uses.
+    """
+    if hyperscan is None:
+        return None, ()
+    localities = []
+    expressions = []
+    for locality, patterns in LOCALITY_PATTERNS.items():
+        for pattern in patterns:
+            localities.append(locality)
+            expressions.append(pattern.replace(r"\b", "").encode("ascii"))
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(expressions),
+    )
+    return database, tuple(localities)
+
+
+_HS_DB, _HS_LOCALITIES = _build_hyperscan_db()
+
+# Hyperscan scratch space cannot be shared between concurrent scans
+_hs_local = threading.local()
+
+
+def _hs_scratch():
+    scratch = getattr(_hs_local, "scratch", None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_HS_DB)
+    return scratch
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+def _at_word_boundary(data, start, end):
+    """True if the UTF-8 match ``data[start:end]`` is not inside a longer word."""
+    if start > 0:
+        lead = start - 1
+        while lead > 0 and 0x80 <= data[lead] < 0xC0:
+            lead -= 1
+        if _is_word_char(data[lead:start].decode("utf-8", "replace")[-1]):
+            return False
+    if end < len(data):
+        tail = end + 1
+        while tail < len(data) and 0x80 <= data[tail] < 0xC0:
+            tail += 1
+        if _is_word_char(data[end:tail].decode("utf-8", "replace")[0]):
+            return False
+    return True
+
+
+# LRU caches of detection results keyed by a digest of the text, so re-crawled
+# or re-processed documents skip the scan entirely
+_DETECTION_CACHE_SIZE = 4096
+_locality_cache = OrderedDict()
+_region_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _text_digest(text):
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _cached(cache, text, compute):
+    key = _text_digest(text)
+    with _cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    value = compute(text)
+    with _cache_lock:
+        cache[key] = value
+        if len(cache) > _DETECTION_CACHE_SIZE:
+            cache.popitem(last=False)
+    return value
+
+
+def clear_detection_cache():
+    """Drop all cached locality/region detection results."""
+    with _cache_lock:
+        _locality_cache.clear()
+        _region_cache.clear()
+
 
 def normalize_locality_name(name):
     """Normalize a locality name to a consistent format for IDs."""
     return name.lower().replace(' ', '_')
 
 
+# Graph node id for each locality, computed and interned once instead of per edge
+_LOCALITY_ID_MAP = {
+    locality: sys.intern(f"loc_{normalize_locality_name(locality)}")
+    for locality in HAMPTON_ROADS_LOCALITIES
+}
+_REGION_ID = sys.intern("region_hampton_roads")
+
+
 def detect_localities(text):
     """Detect mentions of Hampton Roads localities in text.
     
     Returns a dictionary with the locality names as keys and
-    the number of mentions as values.
+    the number of mentions as values.  Overlapping variants of the same
+    locality (e.g. "York" within "York County") count as one mention.
     """
     if not text:
         return {}
     
+    # Copy so callers cannot mutate the cached entry
+    return dict(_cached(_locality_cache, text, _scan_localities))
+
+
+def _scan_localities(text):
     results = {}
     
-    # Check for each locality
-    for locality, patterns in LOCALITY_PATTERNS.items():
-        count = 0
-        for pattern in patterns:
-            count += len(re.findall(pattern, text, re.IGNORECASE))
+    if _HS_DB is not None:
+        # Single DFA pass over the text for all keyword variants
+        data = text.encode("utf-8", "ignore")
+        seen = set()
         
-        if count > 0:
-            results[locality] = count
+        def on_match(expr_id, start, end, flags, context):
+            key = (_HS_LOCALITIES[expr_id], start)
+            if key not in seen and _at_word_boundary(data, start, end):
+                seen.add(key)
+                results[key[0]] = results.get(key[0], 0) + 1
+        
+        _HS_DB.scan(data, match_event_handler=on_match, scratch=_hs_scratch())
+        return results
+    
+    for match in _LOCALITY_RE.finditer(text):
+        locality = _GROUP_TO_LOCALITY[match.lastgroup]
+        results[locality] = results.get(locality, 0) + 1
     
     return results
 
@@ -82,11 +223,11 @@ def detect_region(text):
     if not text:
         return False
     
-    for pattern in REGION_PATTERNS:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
-    
-    return False
+    return _cached(_region_cache, text, _scan_region)
+
+
+def _scan_region(text):
+    return _REGION_RE.search(text) is not None
 
 
 def add_locality_relations_to_graph(G, document_id, text):
@@ -108,37 +249,33 @@ def add_locality_relations_to_graph(G, document_id, text):
     # Current timestamp
     now_iso = datetime.now().isoformat()
     
-    # Add edges for each detected locality
+    # Build every edge first and insert them in one batch
+    edges = []
     locality_ids = []
     for locality, count in localities.items():
-        locality_id = f"loc_{normalize_locality_name(locality)}"
+        locality_id = _LOCALITY_ID_MAP[locality]
         
         # Skip if locality node doesn't exist
         if locality_id not in G:
             continue
         
-        # Add edge from document to locality
-        G.add_edge(
-            document_id,
-            locality_id,
-            type=EdgeType.LOCATED_IN.value,
-            timestamp=now_iso,
-            confidence=min(1.0, count / 10),  # Higher count = higher confidence, max 1.0
-            mentions=count
-        )
-        
+        edges.append((document_id, locality_id, {
+            "type": LOCATED_IN,
+            "timestamp": now_iso,
+            "confidence": min(1.0, count / 10),  # Higher count = higher confidence, max 1.0
+            "mentions": count,
+        }))
         locality_ids.append(locality_id)
     
     # Check for region mentions
     if detect_region(text):
-        region_id = "region_hampton_roads"
-        if region_id in G:
-            G.add_edge(
-                document_id,
-                region_id,
-                type=EdgeType.LOCATED_IN.value,
-                timestamp=now_iso,
-                subtype="explicit_mention"
-            )
+        if _REGION_ID in G:
+            edges.append((document_id, _REGION_ID, {
+                "type": LOCATED_IN,
+                "timestamp": now_iso,
+                "subtype": "explicit_mention",
+            }))
+    
+    G.add_edges_from(edges)
     
-    return locality_ids 
\ No newline at end of file
+    return locality_ids
@@ -6,23 +6,44 @@ The goal is to provide a clean, import-friendly API:
 so other modules (validation, enrichment, etc.) never import the big
 monolithic enhanced_document_processor directly.
 """
-from typing import Dict, Any, Optional
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 
 from phi3_wrapper import Phi3Processor  # existing implementation
 from enhanced_document_processor import extract_text_from_document  # reuse util
 
 # Singleton cache so we don’t reload the model every call
 _model: Optional[Phi3Processor] = None
+_model_lock = threading.Lock()
 
 
 def get_model(model_path: str = "/models/phi3.gguf", **kwargs) -> Phi3Processor:
     """Return a cached Phi-3 model instance (lazy-loaded)."""
     global _model
     if _model is None:
-        _model = Phi3Processor(model_path=model_path, **kwargs)
+        with _model_lock:
+            # Re-check: another thread (e.g. warm()) may have loaded it meanwhile
+            if _model is None:
+                _model = Phi3Processor(model_path=model_path, **kwargs)
     return _model
 
 
+def warm(model_path: str = "/models/phi3.gguf", **kwargs) -> threading.Thread:
+    """Start loading the model in a background thread.
+
+    Call early in process start-up so the first ``extract_metadata`` call
+    does not pay the load cost.  Returns the (daemon) thread so callers can
+    ``join()`` it if they need to wait.
+    """
+    thread = threading.Thread(
+        target=get_model, args=(model_path,), kwargs=kwargs, name="phi3-warm", daemon=True
+    )
+    thread.start()
+    return thread
+
+
 def extract_metadata(document_path: str) -> Dict[str, Any]:
     """Extract structured metadata from a document path.
 
@@ -37,3 +58,17 @@ def extract_metadata(document_path: str) -> Dict[str, Any]:
     text = extract_text_from_document(document_path)
     model = get_model()
     return model.process_document_text(text)
+
+
+def extract_metadata_batch(paths: List[str]) -> List[Dict[str, Any]]:
+    """Extract metadata for many documents, preserving input order.
+
+    Text extraction is I/O-bound, so it runs in a thread pool and overlaps
+    with inference; each text is processed as soon as it is ready.
+    """
+    if not paths:
+        return []
+    model = get_model()
+    with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as pool:
+        return [model.process_document_text(text)
+                for text in pool.map(extract_text_from_document, paths)]
@@ -0,0 +1,63 @@
+"""Unit tests for the locality detector."""
+import pytest
+
+from extraction import locality_detector
+from extraction.locality_detector import detect_localities, detect_region
+
+SAMPLE_TEXT = (
+    "Norfolk and NFK partnered with Virginia Beach (VB). York County and York "
+    "signed on, as did Southampton County. xNorfolk and Norfolk_ are not mentions."
+)
+
+EXPECTED = {
+    "NORFOLK": 2,
+    "VIRGINIA BEACH": 2,
+    "YORK": 2,
+    "SOUTHAMPTON": 1,
+}
+
+
+@pytest.fixture(params=["hyperscan", "regex"])
+def backend(request, monkeypatch):
+    """Run each test against the Hyperscan path and the regex fallback."""
+    locality_detector.clear_detection_cache()
+    if request.param == "regex":
+        monkeypatch.setattr(locality_detector, "_HS_DB", None)
+    elif locality_detector._HS_DB is None:
+        pytest.skip("hyperscan not installed")
+    return request.param
+
+
+def test_detect_localities_counts(backend):
+    """Each mention counts once, including overlapping variants."""
+    assert detect_localities(SAMPLE_TEXT) == EXPECTED
+
+
+def test_detect_localities_case_insensitive(backend):
+    assert detect_localities("NEWPORT NEWS and newport news") == {"NEWPORT NEWS": 2}
+
+
+def test_detect_localities_empty(backend):
+    assert detect_localities("") == {}
+    assert detect_localities(None) == {}
+    assert detect_localities("Richmond only") == {}
+
+
+def test_detect_localities_non_ascii_word_boundaries(backend):
+    """Accented letters are word characters on both backends."""
+    text = "éNorfolk, Norfolké and Norfolk–Hampton; ÉYork, naïveYork and Straße Norfolk."
+    assert detect_localities(text) == {"NORFOLK": 2, "HAMPTON": 1}
+
+
+def test_detect_localities_cached(backend):
+    """Repeated texts are served from the cache and return independent copies."""
+    first = detect_localities(SAMPLE_TEXT)
+    first["NORFOLK"] = 99
+    assert detect_localities(SAMPLE_TEXT) == EXPECTED
+
+
+def test_detect_region():
+    assert detect_region("Across Hampton Roads today")
+    assert detect_region("the tidewater area")
+    assert not detect_region("Richmond only")
+    assert not detect_region("")
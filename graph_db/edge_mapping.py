@@ -4,14 +4,22 @@ This module provides tools to map free-text relationship descriptions
 to canonical EdgeType enum values. It loads a YAML mapping file and
 provides helper functions to normalize relationship texts.
 """
+import os
 import yaml
+import json
 import pathlib
 import logging
+from functools import lru_cache
 from typing import Dict, Optional, Set
 from threading import Lock
 
 from .schema import EdgeType
 
+try:
+    from yaml import CSafeLoader as _Loader  # libyaml-backed, much faster
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 logger = logging.getLogger(__name__)
 
 _MAPPING_FILE = pathlib.Path(__file__).with_suffix('.yaml')
@@ -19,22 +27,58 @@ _mapping_cache: Dict[str, str] = {}
 _mapping_lock = Lock()
 _last_mtime = 0
 
-def _load_mapping() -> Dict[str, str]:
-    """Load the edge mapping from YAML file."""
+def _sidecar_path() -> pathlib.Path:
+    """JSON cache of the parsed mapping, stored next to the YAML file."""
+    return _MAPPING_FILE.with_suffix('.json')
+
+def _read_sidecar(stat: os.stat_result) -> Optional[Dict[str, str]]:
+    """Return the cached mapping if the sidecar was built from this exact YAML."""
+    try:
+        cached = json.loads(_sidecar_path().read_text())
+    except (OSError, ValueError):
+        return None
+    if cached.get("source_mtime_ns") != stat.st_mtime_ns or cached.get("source_size") != stat.st_size:
+        return None
+    return cached.get("mapping")
+
+def _write_sidecar(stat: os.stat_result, mapping: Dict[str, str]) -> None:
+    """Atomically write the parsed mapping to the JSON sidecar."""
+    sidecar = _sidecar_path()
+    tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps({
+            "source_mtime_ns": stat.st_mtime_ns,
+            "source_size": stat.st_size,
+            "mapping": mapping,
+        }))
+        os.replace(tmp, sidecar)
+    except OSError as e:
+        logger.debug(f"Could not write edge mapping cache {sidecar}: {e}")
+        tmp.unlink(missing_ok=True)
+
+def _load_mapping(use_sidecar: bool = True) -> Dict[str, str]:
+    """Load the edge mapping from YAML file (or its fresh JSON sidecar)."""
     global _mapping_cache, _last_mtime
     
     try:
-        current_mtime = _MAPPING_FILE.stat().st_mtime
+        stat = _MAPPING_FILE.stat()
+        current_mtime = stat.st_mtime
         
         with _mapping_lock:
             # Check if file has been modified since last load
             if not _mapping_cache or current_mtime > _last_mtime:
-                logger.info(f"Loading edge mapping from {_MAPPING_FILE}")
-                mapping = yaml.safe_load(_MAPPING_FILE.read_text())
-                
-                # Store normalized keys (lowercase, stripped)
-                _mapping_cache = {k.lower().strip(): v for k, v in mapping.items()}
+                mapping = _read_sidecar(stat) if use_sidecar else None
+                if mapping is not None:
+                    _mapping_cache = mapping
+                else:
+                    logger.info(f"Loading edge mapping from {_MAPPING_FILE}")
+                    mapping = yaml.load(_MAPPING_FILE.read_text(), Loader=_Loader)
+                    
+                    # Store normalized keys (lowercase, stripped)
+                    _mapping_cache = {k.lower().strip(): v for k, v in mapping.items()}
+                    _write_sidecar(stat, _mapping_cache)
                 _last_mtime = current_mtime
+                _canonical_edge_cached.cache_clear()
                 logger.info(f"Loaded {len(_mapping_cache)} edge mappings")
             
         return _mapping_cache
@@ -53,11 +97,15 @@ def canonical_edge(text: str) -> Optional[EdgeType]:
     """
     if not text:
         return None
-        
-    text = text.lower().strip()
-    mapping = _load_mapping()
     
-    enum_name = mapping.get(text)
+    # Picks up mapping file changes (and clears the lookup cache) before the lookup
+    _load_mapping()
+    return _canonical_edge_cached(text.lower().strip())
+
+@lru_cache(maxsize=2048)
+def _canonical_edge_cached(normalized: str) -> Optional[EdgeType]:
+    """Resolve a normalized relation text against the loaded mapping."""
+    enum_name = _mapping_cache.get(normalized)
     if enum_name:
         try:
             return EdgeType[enum_name]
@@ -76,7 +124,7 @@ def get_all_relation_texts() -> Set[str]:
     return set(mapping.keys())
 
 def reload_mapping() -> int:
-    """Force reload of the edge mapping file.
+    """Force reload of the edge mapping file, bypassing the JSON sidecar.
     
     Returns:
         The number of mappings loaded
@@ -86,8 +134,9 @@ def reload_mapping() -> int:
     with _mapping_lock:
         _mapping_cache = {}
         _last_mtime = 0
+        _canonical_edge_cached.cache_clear()
         
-    mapping = _load_mapping()
+    mapping = _load_mapping(use_sidecar=False)
     return len(mapping)
 
 def get_mapping_file_path() -> str:
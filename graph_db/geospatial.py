@@ -7,21 +7,137 @@ Usage::
 """
 from __future__ import annotations
 
-import math
-from typing import List, Tuple, Callable
+import weakref
+from typing import Callable, Dict, List, NamedTuple, Tuple
 
 import networkx as nx
+import numpy as np
 from sklearn.neighbors import BallTree  # type: ignore
 
-from .schema import EdgeType, EDGE_DISTANCE
+from .schema import NEARBY, EDGE_DISTANCE
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - optional accelerator
+    njit = None
 
 EARTH_R = 6371.0088  # km – mean Earth radius (WGS-84)
 
 
-def _to_rad(latlon: Tuple[float, float]) -> Tuple[float, float]:
-    """Convert (lat, lon) degrees to radians."""
-    lat, lon = latlon
-    return math.radians(lat), math.radians(lon)
+class _GeoIndex(NamedTuple):
+    """Coordinate nodes of a graph plus their BallTree."""
+
+    nodes: List[str]
+    coords: List[Tuple[float, float]]
+    index: Dict[str, int]
+    coords_rad: np.ndarray
+    tree: BallTree | None
+
+
+# Cached spatial index per graph object.  Kept off ``G.graph`` so copies of a
+# graph do not inherit it and the graph stays JSON-serialisable.
+_GEO_INDEXES: "weakref.WeakKeyDictionary[nx.Graph, _GeoIndex]" = weakref.WeakKeyDictionary()
+
+
+def invalidate_geo_index(G: nx.Graph) -> None:
+    """Drop the cached spatial index of *G*.
+
+    Node and coordinate changes are detected automatically; this is only
+    needed after mutating a ``coordinates`` value in place.
+    """
+    _GEO_INDEXES.pop(G, None)
+
+
+def _coordinate_nodes(
+    G: nx.Graph, node_filter: Callable[[str, dict], bool]
+) -> Tuple[List[str], List[Tuple[float, float]]]:
+    nodes: List[str] = []
+    coords: List[Tuple[float, float]] = []
+    for n, d in G.nodes(data=True):
+        if node_filter(n, d):
+            nodes.append(n)
+            coords.append(tuple(d["coordinates"]))
+    return nodes, coords
+
+
+def _build_geo_index(nodes: List[str], coords: List[Tuple[float, float]]) -> _GeoIndex:
+    # BallTree in radians from an (N, 2) array of (lat, lon)
+    coords_rad = np.deg2rad(np.asarray(coords, dtype=np.float64).reshape(-1, 2))
+    tree = BallTree(coords_rad, metric="haversine") if len(nodes) >= 2 else None
+    return _GeoIndex(
+        nodes=nodes,
+        coords=coords,
+        index={n: i for i, n in enumerate(nodes)},
+        coords_rad=coords_rad,
+        tree=tree,
+    )
+
+
+def _has_coordinates(n: str, d: dict) -> bool:
+    return "coordinates" in d
+
+
+def _geo_index(G: nx.Graph, node_filter: Callable[[str, dict], bool] | None) -> _GeoIndex:
+    """Return the spatial index for *G*, reusing the cached one when current.
+
+    Only the default filter (nodes with ``coordinates``) is cached; a custom
+    *node_filter* always builds a fresh, uncached index.  The cache is reused
+    only while the coordinate nodes and their coordinates are unchanged, which
+    costs one pass over the nodes instead of a BallTree rebuild.
+    """
+    if node_filter is not None:
+        return _build_geo_index(*_coordinate_nodes(G, node_filter))
+
+    nodes, coords = _coordinate_nodes(G, _has_coordinates)
+    cached = _GEO_INDEXES.get(G)
+    if cached is not None and cached.nodes == nodes and cached.coords == coords:
+        return cached
+    geo = _build_geo_index(nodes, coords)
+    _GEO_INDEXES[G] = geo
+    return geo
+
+
+def _filter_pairs_numpy(dists: np.ndarray, idxs: np.ndarray, max_km: float, earth_r: float) -> np.ndarray:
+    """Return an (M, 3) float64 array of (i, j, km) neighbour pairs within *max_km*.
+
+    Column 0 of *dists*/*idxs* is the query point itself and is skipped, as
+    are self-pairs that appear later when nodes share coordinates.
+    """
+    km = dists[:, 1:] * earth_r
+    nbrs = idxs[:, 1:]
+    rows = np.broadcast_to(np.arange(len(idxs))[:, None], nbrs.shape)
+    mask = (km <= max_km) & (nbrs != rows)
+    return np.column_stack([rows[mask], nbrs[mask], km[mask]]).astype(np.float64)
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _filter_pairs(dists, idxs, max_km, earth_r):  # pragma: no cover - compiled
+        """Numba version of :func:`_filter_pairs_numpy` (same output, row order)."""
+        n, width = dists.shape
+        counts = np.zeros(n, dtype=np.int64)
+        for i in prange(n):
+            c = 0
+            for col in range(1, width):
+                if dists[i, col] * earth_r <= max_km and idxs[i, col] != i:
+                    c += 1
+            counts[i] = c
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+        out = np.empty((offsets[n], 3), dtype=np.float64)
+        for i in prange(n):
+            pos = offsets[i]
+            for col in range(1, width):
+                km = dists[i, col] * earth_r
+                j = idxs[i, col]
+                if km <= max_km and j != i:
+                    out[pos, 0] = i
+                    out[pos, 1] = j
+                    out[pos, 2] = km
+                    pos += 1
+        return out
+else:
+    _filter_pairs = _filter_pairs_numpy
 
 
 def add_nearest_edges(
@@ -39,38 +155,46 @@ def add_nearest_edges(
         The target graph (modified in place).
     node_filter : callable, optional
         Function (node_id, attrs) -> bool selecting nodes to include.
-        Defaults to nodes having a 'coordinates' attribute.
+        Defaults to nodes having a 'coordinates' attribute, in which case
+        the spatial index is cached per graph and reused while those nodes
+        and their coordinates are unchanged.
     k : int
         Number of nearest neighbours to connect (default 3).
     max_km : float
         Maximum great-circle distance in kilometres for an edge.
     """
-    if node_filter is None:
-        node_filter = lambda n, d: "coordinates" in d  # noqa: E731
-
-    # Collect candidate nodes
-    nodes: List[str] = [n for n, d in G.nodes(data=True) if node_filter(n, d)]
+    geo = _geo_index(G, node_filter)
+    nodes = geo.nodes
     if len(nodes) < 2:
         return  # nothing to connect
-
-    # Build BallTree in radians
-    coords_rad = [_to_rad(G.nodes[n]["coordinates"]) for n in nodes]
-    tree = BallTree(coords_rad, metric="haversine")
+    coords_rad, tree = geo.coords_rad, geo.tree
 
     # Query k+1 because first neighbour is the node itself (distance=0)
-    dists, idxs = tree.query(coords_rad, k=min(k + 1, len(nodes)))
-
-    for i, src in enumerate(nodes):
-        for dist, j in zip(dists[i][1:], idxs[i][1:]):
-            km = dist * EARTH_R
-            if km <= max_km:
-                dst = nodes[j]
-                # Avoid duplicating reverse edge
-                if G.has_edge(src, dst) or G.has_edge(dst, src):
-                    continue
-                G.add_edge(
-                    src,
-                    dst,
-                    type=EdgeType.NEARBY.value,
-                    **{EDGE_DISTANCE: round(km, 2)},
-                )
+    dists, idxs = tree.query(coords_rad, k=min(k + 1, len(nodes)), dualtree=True)
+
+    # Radius filter -> (M, 3) array of (src_idx, dst_idx, km) candidates,
+    # in query-point order then neighbour order
+    candidates = _filter_pairs(dists, idxs, max_km, EARTH_R)
+
+    # Existing edges (either direction) between candidate nodes, as sorted
+    # integer index pairs so the filter below hashes ints instead of node ids
+    index = geo.index
+    seen = set()
+    for i, n in enumerate(nodes):
+        for nbr in G.adj[n]:
+            j = index.get(nbr)
+            if j is not None:
+                seen.add((i, j) if i < j else (j, i))
+
+    # Keep each undirected pair once, pointing from the first query point
+    # that found it to its neighbour
+    edges = []
+    for i, j, dist in zip(candidates[:, 0].astype(np.int64).tolist(),
+                          candidates[:, 1].astype(np.int64).tolist(),
+                          candidates[:, 2].tolist()):
+        key = (i, j) if i < j else (j, i)
+        if key in seen:
+            continue
+        seen.add(key)
+        edges.append((nodes[i], nodes[j], {"type": NEARBY, EDGE_DISTANCE: round(dist, 2)}))
+    G.add_edges_from(edges)
@@ -1,39 +1,74 @@
 """Utilities to convert between the existing JSON graph format and
 an in-memory NetworkX graph.
 """
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, Union
 import networkx as nx
-from .schema import EdgeType, EDGE_TIMESTAMP, EDGE_CONFIDENCE, EDGE_MESSAGE
+import orjson
+from .schema import EdgeType, EDGE_TIMESTAMP, EDGE_CONFIDENCE, EDGE_MESSAGE, LINEAGE_EDGE_TYPES
 
-NODE_KEYS = {"id", "label", "type", "properties"}
+NODE_KEYS = frozenset({"id", "label", "type", "properties"})
+EDGE_KEYS = frozenset({"source", "target"})
+_NODE_ATTR_KEYS = frozenset({"label", "type"})
+
+# Graph attribute counting lineage edits; caches of lineage structure (see
+# visualization.git_graph) are rebuilt when it changes
+LINEAGE_VERSION_KEY = "lineage_version"
 
 
 def dict_to_nx(graph_dict: Dict[str, Any]) -> nx.DiGraph:
     """Convert JSON (as produced by enhanced_document_processor) to NetworkX."""
+    node_keys = NODE_KEYS
+    edge_keys = EDGE_KEYS
     G = nx.DiGraph()
-    for node in graph_dict.get("nodes", []):
-        attrs = {k: v for k, v in node.items() if k not in NODE_KEYS}
-        attrs.update(node.get("properties", {}))
-        G.add_node(node["id"], label=node.get("label"), type=node.get("type"), **attrs)
-
-    for edge in graph_dict.get("edges", []):
-        G.add_edge(edge["source"], edge["target"], **{k: v for k, v in edge.items() if k not in {"source", "target"}})
+    G.add_nodes_from(
+        (
+            node["id"],
+            {
+                "label": node.get("label"),
+                "type": node.get("type"),
+                **{k: v for k, v in node.items() if k not in node_keys},
+                **node.get("properties", {}),
+            },
+        )
+        for node in graph_dict.get("nodes", [])
+    )
+    G.add_edges_from(
+        (edge["source"], edge["target"], {k: v for k, v in edge.items() if k not in edge_keys})
+        for edge in graph_dict.get("edges", [])
+    )
     return G
 
 
 def nx_to_dict(G: nx.DiGraph) -> Dict[str, Any]:
-    nodes = []
-    for nid, data in G.nodes(data=True):
-        props = {k: v for k, v in data.items() if k not in {"label", "type"}}
-        nodes.append({"id": nid, "label": data.get("label", nid), "type": data.get("type", "unknown"), "properties": props})
+    excluded = _NODE_ATTR_KEYS
+    nodes = [
+        {
+            "id": nid,
+            "label": data.get("label", nid),
+            "type": data.get("type", "unknown"),
+            "properties": {k: v for k, v in data.items() if k not in excluded},
+        }
+        for nid, data in G.nodes(data=True)
+    ]
+    edges = [{"source": u, "target": v, **data} for u, v, data in G.edges(data=True)]
+    return {"nodes": nodes, "edges": edges}
 
-    edges = []
-    for u, v, data in G.edges(data=True):
-        edge_entry = {"source": u, "target": v}
-        edge_entry.update(data)
-        edges.append(edge_entry)
 
-    return {"nodes": nodes, "edges": edges}
+def load_graph(path: Union[str, Path]) -> nx.DiGraph:
+    """Read a JSON graph file (nodes/edges format) straight into NetworkX."""
+    return dict_to_nx(orjson.loads(Path(path).read_bytes()))
+
+
+def dump_graph(G: nx.DiGraph, path: Union[str, Path]) -> None:
+    """Write *G* to *path* in the nodes/edges JSON format.
+
+    NumPy scalars (e.g. geospatial distances) and non-string keys are
+    serialised natively by orjson.
+    """
+    Path(path).write_bytes(
+        orjson.dumps(nx_to_dict(G), option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -56,6 +91,16 @@ def add_lineage_edge(G: nx.DiGraph, src: str, dst: str, edge_type: EdgeType, tim
     """
     attr = {EDGE_TIMESTAMP: timestamp, **meta}
     G.add_edge(src, dst, type=edge_type.value if isinstance(edge_type, EdgeType) else str(edge_type), **attr)
+    bump_lineage_version(G)
+
+
+def bump_lineage_version(G: nx.DiGraph) -> None:
+    """Record that the lineage structure of *G* changed.
+
+    :func:`add_lineage_edge` calls this; call it yourself after adding,
+    removing or retyping lineage edges (or swapping nodes) any other way.
+    """
+    G.graph[LINEAGE_VERSION_KEY] = G.graph.get(LINEAGE_VERSION_KEY, 0) + 1
 
 
 def get_lineage(G: nx.DiGraph, node_id: str, direction: str = "backward"):
@@ -65,5 +110,4 @@ def get_lineage(G: nx.DiGraph, node_id: str, direction: str = "backward"):
     direction = "forward"   → successors (descendants)
     """
     neighbors = G.pred[node_id].items() if direction == "backward" else G.succ[node_id].items()
-    lineage_types = {t.value for t in (EdgeType.DERIVES_FROM, EdgeType.IMPLEMENTS, EdgeType.INFLUENCED, EdgeType.SUPERSEDES)}
-    return [(n, d) for n, d in neighbors if d.get("type") in lineage_types]
+    return [(n, d) for n, d in neighbors if d.get("type") in LINEAGE_EDGE_TYPES]
@@ -5,7 +5,9 @@ This module defines
 • EdgeType – allowed edge relations
 plus helper attribute keys shared across the codebase.
 """
+import sys
 from enum import Enum
+from typing import FrozenSet, Final
 
 # Current schema version - increment on breaking changes
 SCHEMA_VERSION = 4
@@ -42,6 +44,7 @@ class EdgeType(str, Enum):
     # spatial relations
     LOCATED_IN = "located_in"       # document/project → locality
     SERVES_REGION = "serves_region" # project → region
+    NEARBY = "nearby"               # spatial neighbour (geospatial.add_nearest_edges)
     
     # telemetry relations
     MEASURES = "measures"           # sensor → metric
@@ -66,6 +69,19 @@ class EdgeType(str, Enum):
     ORIGINATED_FROM = "originated_from" # company/startup → locality
 
 
+
+# Plain-str mirrors of EdgeType values used on hot paths; comparing against or
+# storing these skips the Enum member/descriptor lookup, and interning lets
+# dict/set lookups short-circuit on identity.  Keep EdgeType for
+# validation and public APIs.
+LOCATED_IN: Final[str] = sys.intern(EdgeType.LOCATED_IN.value)
+NEARBY: Final[str] = sys.intern(EdgeType.NEARBY.value)
+DERIVES_FROM: Final[str] = sys.intern(EdgeType.DERIVES_FROM.value)
+IMPLEMENTS: Final[str] = sys.intern(EdgeType.IMPLEMENTS.value)
+INFLUENCED: Final[str] = sys.intern(EdgeType.INFLUENCED.value)
+SUPERSEDES: Final[str] = sys.intern(EdgeType.SUPERSEDES.value)
+LINEAGE_EDGE_TYPES: Final[FrozenSet[str]] = frozenset({DERIVES_FROM, IMPLEMENTS, INFLUENCED, SUPERSEDES})
+
 # Common attribute keys for edges
 EDGE_TIMESTAMP = "timestamp"   # ISO-8601 string
 EDGE_CONFIDENCE = "confidence" # float 0-1
@@ -86,6 +102,13 @@ NODE_LON = "lng"
 __all__ = [
     "NodeType",
     "EdgeType",
+    "LOCATED_IN",
+    "NEARBY",
+    "DERIVES_FROM",
+    "IMPLEMENTS",
+    "INFLUENCED",
+    "SUPERSEDES",
+    "LINEAGE_EDGE_TYPES",
     "EDGE_TIMESTAMP",
     "EDGE_CONFIDENCE",
     "EDGE_MESSAGE",
@@ -44,6 +44,7 @@ def temp_mapping_file():
     
     # Clean up
     os.unlink(temp_path)
+    pathlib.Path(temp_path).with_suffix('.json').unlink(missing_ok=True)
     
     # Restore original mapping if needed (only for tests that modified it)
     if original_file.exists() and original_content:
@@ -106,4 +107,20 @@ def test_reload_mapping(temp_mapping_file):
     assert count == 7
     
     # Verify new relation is available
-    assert canonical_edge("new relation") == EdgeType.ACQUIRED 
\ No newline at end of file
+    assert canonical_edge("new relation") == EdgeType.ACQUIRED
+
+def test_json_sidecar_cache(temp_mapping_file):
+    """A fresh JSON sidecar is written and used instead of re-parsing YAML."""
+    sidecar = pathlib.Path(temp_mapping_file).with_suffix('.json')
+    assert sidecar.exists()
+    
+    # Force the next load through the sidecar path without parsing YAML
+    with patch('graph_db.edge_mapping._mapping_cache', {}), \
+         patch('graph_db.edge_mapping.yaml.load', side_effect=AssertionError("YAML parsed")):
+        assert canonical_edge("bought") == EdgeType.ACQUIRED
+    
+    # Modifying the YAML invalidates the sidecar
+    with open(temp_mapping_file, 'a') as f:
+        f.write("purchased: ACQUIRED\n")
+    with patch('graph_db.edge_mapping._mapping_cache', {}):
+        assert canonical_edge("purchased") == EdgeType.ACQUIRED
@@ -0,0 +1,131 @@
+"""Unit tests for nearest-neighbour spatial edges."""
+import pytest
+
+nx = pytest.importorskip("networkx")
+pytest.importorskip("sklearn")
+
+from graph_db.geospatial import add_nearest_edges
+from graph_db.schema import EdgeType, EDGE_DISTANCE
+
+# (lat, lon) of a few Hampton Roads points; Richmond is far from the rest
+COORDS = {
+    "norfolk": (36.8508, -76.2859),
+    "portsmouth": (36.8354, -76.2983),
+    "chesapeake": (36.7682, -76.2875),
+    "virginia_beach": (36.8529, -75.9780),
+    "richmond": (37.5407, -77.4360),
+}
+
+
+@pytest.fixture
+def graph():
+    G = nx.DiGraph()
+    for node, coords in COORDS.items():
+        G.add_node(node, coordinates=coords)
+    G.add_node("no_coords")
+    return G
+
+
+def _undirected_pairs(G):
+    return {frozenset((u, v)) for u, v in G.edges()}
+
+
+def test_add_nearest_edges_within_radius(graph):
+    add_nearest_edges(graph, k=2, max_km=15)
+
+    pairs = _undirected_pairs(graph)
+    assert frozenset(("norfolk", "portsmouth")) in pairs
+    assert frozenset(("norfolk", "chesapeake")) in pairs
+    assert not any("richmond" in p or "no_coords" in p for p in pairs)
+
+    for _, _, data in graph.edges(data=True):
+        assert data["type"] == EdgeType.NEARBY.value
+        assert 0 < data[EDGE_DISTANCE] <= 15
+
+
+def test_add_nearest_edges_point_from_query_node(graph):
+    """Each edge points from the first node (in graph order) that found the pair."""
+    add_nearest_edges(graph, k=2, max_km=15)
+
+    assert graph.has_edge("norfolk", "portsmouth")
+    assert graph.has_edge("norfolk", "chesapeake")
+    assert not graph.has_edge("portsmouth", "norfolk")
+    assert not graph.has_edge("chesapeake", "norfolk")
+
+
+def test_add_nearest_edges_no_reverse_duplicates(graph):
+    graph.add_edge("portsmouth", "norfolk", type="existing")
+    add_nearest_edges(graph, k=3, max_km=50)
+
+    assert not graph.has_edge("norfolk", "portsmouth")
+    assert graph.number_of_edges() == len(_undirected_pairs(graph))
+
+
+def test_add_nearest_edges_too_few_nodes():
+    G = nx.DiGraph()
+    G.add_node("only", coordinates=(36.85, -76.28))
+    add_nearest_edges(G)
+    assert G.number_of_edges() == 0
+
+
+def test_filter_pairs_matches_numpy_reference():
+    """The (optionally JIT-compiled) filter agrees with the NumPy version."""
+    np = pytest.importorskip("numpy")
+    from graph_db.geospatial import EARTH_R, _filter_pairs, _filter_pairs_numpy
+
+    dists = np.array([[0.0, 0.001, 0.01], [0.0, 0.001, 0.002], [0.0, 0.0, 0.002]])
+    idxs = np.array([[0, 1, 2], [1, 0, 2], [2, 2, 1]])
+    expected = _filter_pairs_numpy(dists, idxs, 15.0, EARTH_R)
+
+    assert expected[:, :2].tolist() == [[0, 1], [1, 0], [1, 2], [2, 1]]
+    np.testing.assert_allclose(_filter_pairs(dists, idxs, 15.0, EARTH_R), expected)
+
+
+def test_add_nearest_edges_nothing_in_range(graph):
+    add_nearest_edges(graph, k=2, max_km=0.1)
+    assert graph.number_of_edges() == 0
+
+
+def test_geo_index_cached_until_coordinates_change(graph):
+    from graph_db.geospatial import _geo_index
+
+    cached = _geo_index(graph, None)
+    add_nearest_edges(graph, k=2, max_km=15)
+    assert _geo_index(graph, None) is cached
+
+    graph.nodes["richmond"]["coordinates"] = (36.86, -76.29)
+    add_nearest_edges(graph, k=2, max_km=15)
+    assert _geo_index(graph, None) is not cached
+    assert frozenset(("richmond", "norfolk")) in _undirected_pairs(graph)
+
+
+def test_geo_index_rebuilt_when_node_swapped(graph):
+    """Removing one node and adding another keeps the count but not the index."""
+    add_nearest_edges(graph, k=2, max_km=15)
+    graph.remove_node("richmond")
+    graph.add_node("norfolk_2", coordinates=(36.851, -76.286))
+    add_nearest_edges(graph, k=2, max_km=15)
+    assert "norfolk_2" in {n for pair in _undirected_pairs(graph) for n in pair}
+
+
+def test_geo_index_not_shared_with_copies_or_serialised(graph):
+    orjson = pytest.importorskip("orjson")
+    from graph_db.geospatial import _geo_index
+
+    cached = _geo_index(graph, None)
+    copy = graph.copy()
+    copy.nodes["richmond"]["coordinates"] = (36.86, -76.29)
+    assert _geo_index(copy, None) is not cached
+    assert _geo_index(graph, None) is cached
+
+    # Nothing lands in the graph attributes that node_link_data would serialise
+    add_nearest_edges(graph, k=2, max_km=15)
+    assert graph.graph == {}
+    assert orjson.dumps(graph.graph) == b"{}"
+
+
+def test_geo_index_rebuilt_when_nodes_added(graph):
+    add_nearest_edges(graph, k=2, max_km=15)
+    graph.add_node("norfolk_2", coordinates=(36.851, -76.286))
+    add_nearest_edges(graph, k=2, max_km=15)
+    assert "norfolk_2" in {n for pair in _undirected_pairs(graph) for n in pair}
@@ -0,0 +1,53 @@
+"""Unit tests for JSON <-> NetworkX conversion and lineage helpers."""
+import pytest
+
+pytest.importorskip("networkx")
+
+from graph_db.graph_builder import add_lineage_edge, dict_to_nx, get_lineage, nx_to_dict
+from graph_db.schema import EdgeType
+
+GRAPH_DICT = {
+    "nodes": [
+        {"id": "p1", "label": "Paper", "type": "research_paper", "year": 2021, "properties": {"doi": "10.1/x"}},
+        {"id": "pat1", "label": "Patent", "type": "patent", "properties": {}},
+    ],
+    "edges": [
+        {"source": "pat1", "target": "p1", "type": "derives_from", "confidence": 0.9},
+    ],
+}
+
+
+def test_dict_to_nx_flattens_properties():
+    G = dict_to_nx(GRAPH_DICT)
+    assert G.nodes["p1"] == {"label": "Paper", "type": "research_paper", "year": 2021, "doi": "10.1/x"}
+    assert G.edges["pat1", "p1"] == {"type": "derives_from", "confidence": 0.9}
+
+
+def test_round_trip():
+    result = nx_to_dict(dict_to_nx(GRAPH_DICT))
+    paper = next(n for n in result["nodes"] if n["id"] == "p1")
+    assert paper["properties"] == {"year": 2021, "doi": "10.1/x"}
+    assert result["edges"] == GRAPH_DICT["edges"]
+
+
+def test_get_lineage_filters_edge_types():
+    G = dict_to_nx(GRAPH_DICT)
+    add_lineage_edge(G, "proj1", "pat1", EdgeType.IMPLEMENTS, "2024-01-01T00:00:00")
+    G.add_edge("pat1", "person1", type=EdgeType.AUTHORED_BY.value)
+
+    assert [n for n, _ in get_lineage(G, "pat1", direction="forward")] == ["p1"]
+    assert [n for n, _ in get_lineage(G, "pat1")] == ["proj1"]
+
+
+def test_dump_and_load_graph(tmp_path):
+    np = pytest.importorskip("numpy")
+    from graph_db.graph_builder import dump_graph, load_graph
+
+    G = dict_to_nx(GRAPH_DICT)
+    G.add_edge("p1", "pat1", type="nearby", distance_km=np.float64(1.25))
+    path = tmp_path / "graph.json"
+    dump_graph(G, path)
+
+    loaded = load_graph(path)
+    assert loaded.nodes["p1"] == G.nodes["p1"]
+    assert loaded.edges["p1", "pat1"]["distance_km"] == 1.25
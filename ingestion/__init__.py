@@ -72,16 +72,21 @@ class SourcePlugin(ABC):
 # Auto-discovery of plugins sub-package
 # ---------------------------------------------------------------------------
 
-try:
-    # Importing this package will trigger auto-registration side-effects for
-    # any modules in ``ingestion.plugins`` because that sub-package’s
-    # ``__init__`` eagerly imports its children.
-    import importlib
 
-    importlib.import_module("ingestion.plugins")
-except ModuleNotFoundError:
-    # The plugins package is optional; continue silently if missing
-    pass
+def _load_plugins() -> None:
+    """Import the ``ingestion.plugins`` modules the first time plugins are needed.
+
+    Importing ``ingestion`` stays cheap: plugin modules (and their heavy
+    dependencies) are only imported by :func:`get_plugins`/:func:`create_plugin`.
+    """
+    try:
+        import importlib
+
+        plugins = importlib.import_module("ingestion.plugins")
+    except ModuleNotFoundError:
+        # The plugins package is optional; continue silently if missing
+        return
+    plugins.load_plugins()
 
 
 # ---------------------------------------------------------------------------
@@ -91,11 +96,13 @@ except ModuleNotFoundError:
 
 def get_plugins() -> List[Type[SourcePlugin]]:
     """Return all registered ingestion plugin classes."""
+    _load_plugins()
     return list(_SOURCE_REGISTRY.values())
 
 
 def create_plugin(name: str, **kwargs) -> SourcePlugin:
     """Instantiate a plugin by its registered *name*."""
+    _load_plugins()
     try:
         cls = _SOURCE_REGISTRY[name]
     except KeyError as exc:
@@ -12,12 +12,17 @@ processing (via :pymod:`Agent.job_queue`).
 from __future__ import annotations
 
 import argparse
+import itertools
 import logging
 import os
+import queue
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Tuple, Type
 
 from dotenv import load_dotenv
 
@@ -26,36 +31,142 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from ingestion import get_plugins  # noqa isort:skip
-from Agent.job_queue import enqueue_document  # noqa isort:skip
+from ingestion import SourcePlugin, get_plugins  # noqa isort:skip
+from Agent.job_queue import enqueue_documents_bulk  # noqa isort:skip
 
 load_dotenv()
 
 logger = logging.getLogger("ingestion.orchestrator")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
+# DocumentWriter batching: max documents per batch and max wait to fill one
+WRITE_BATCH_SIZE = 64
+WRITE_FLUSH_INTERVAL = 0.05  # seconds
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def save_document(content: str, meta: Dict[str, Any], out_dir: Path) -> Path:
-    """Persist document content to disk. Returns file path."""
-    out_dir.mkdir(parents=True, exist_ok=True)
-    # Use timestamp + plugin name + hashed snippet as filename
+# Filename tags: a process-wide counter instead of hashing every document's
+# content; the pid keeps concurrent orchestrator runs from colliding.
+_SEQ = itertools.count()
+
+
+def _tag() -> str:
+    return f"{os.getpid()}-{next(_SEQ) & 0xFFFFFF}"
+
+
+def _write_document(content: str, meta: Dict[str, Any], out_dir: Path) -> Path:
+    # Use timestamp + plugin name + per-process sequence tag as filename
     ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-    snippet = abs(hash(content)) % 10_000_000  # not cryptographic
     plugin = meta.get("source", "unknown")
-    filename = f"{ts}_{plugin}_{snippet}.txt"
+    filename = f"{ts}_{plugin}_{_tag()}.txt"
     path = out_dir / filename
     path.write_text(content, encoding="utf-8")
     return path
 
 
+def save_document(content: str, meta: Dict[str, Any], out_dir: Path) -> Path:
+    """Persist document content to disk. Returns file path."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return _write_document(content, meta, out_dir)
+
+
+class DocumentWriter:
+    """Background writer that saves documents in batches.
+
+    :meth:`submit` only queues the document.  A single thread collects up to
+    ``batch_size`` documents (or whatever arrives within ``flush_interval``
+    seconds), writes them to *out_dir* and passes the batch of
+    ``(path, enqueue_meta)`` pairs to *on_saved*.  Use as a context manager;
+    leaving it flushes outstanding documents.  Single-document callers should
+    keep using :func:`save_document`.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        out_dir: Path,
+        on_saved: Callable[[List[Tuple[str, Dict[str, Any]]]], None],
+        batch_size: int = WRITE_BATCH_SIZE,
+        flush_interval: float = WRITE_FLUSH_INTERVAL,
+    ) -> None:
+        self.out_dir = out_dir
+        self.on_saved = on_saved
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue()
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._loop, name="document-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, content: str, meta: Dict[str, Any], enqueue_meta: Dict[str, Any]) -> None:
+        self._queue.put((content, meta, enqueue_meta))
+
+    def close(self) -> None:
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    def __enter__(self) -> "DocumentWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _loop(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[str, Dict[str, Any], Dict[str, Any]]]) -> None:
+        saved = []
+        for content, meta, enqueue_meta in batch:
+            try:
+                saved.append((str(_write_document(content, meta, self.out_dir)), enqueue_meta))
+            except OSError as exc:
+                logger.error("Failed to save document from %s: %s", enqueue_meta.get("source"), exc)
+        if saved:
+            try:
+                self.on_saved(saved)
+            except Exception as exc:  # keep writing later batches
+                logger.error("Failed to enqueue %d documents: %s", len(saved), exc)
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
+def _run_plugin(plugin_cls: Type[SourcePlugin], writer: DocumentWriter) -> None:
+    """Fetch from one plugin, handing each document to *writer* as it arrives."""
+    plugin = plugin_cls()
+    logger.info("Fetching documents from %s", plugin_cls.name)
+    for doc in plugin.fetch():
+        content = doc.get("content")
+        if not content:
+            logger.debug("Skipped item without content: %s", doc)
+            continue
+        writer.submit(content, doc, {"source": plugin_cls.name})
+
+
 def run(out: Path) -> None:
     plugins = get_plugins()
     if not plugins:
@@ -63,16 +174,17 @@ def run(out: Path) -> None:
         return
 
     logger.info("Running %d ingestion plugins", len(plugins))
-    for plugin_cls in plugins:
-        plugin = plugin_cls()
-        logger.info("Fetching documents from %s", plugin_cls.name)
-        for doc in plugin.fetch():
-            content = doc.get("content")
-            if not content:
-                logger.debug("Skipped item without content: %s", doc)
-                continue
-            path = save_document(content, doc, out)
-            enqueue_document(str(path), meta={"source": plugin_cls.name})
+    # Plugins are independent, mostly network-bound fetchers: run them side
+    # by side and let one background writer batch the disk writes; each
+    # written batch is queued with one Redis round-trip.
+    with DocumentWriter(out, enqueue_documents_bulk) as writer, \
+            ThreadPoolExecutor(max_workers=len(plugins), thread_name_prefix="ingest-plugin") as fetchers:
+        futures = {fetchers.submit(_run_plugin, cls, writer): cls for cls in plugins}
+        wait(futures)
+        for future, plugin_cls in futures.items():
+            exc = future.exception()
+            if exc is not None:
+                logger.error("Plugin %s failed: %s", plugin_cls.name, exc)
 
 
 if __name__ == "__main__":
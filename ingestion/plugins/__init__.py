@@ -1,16 +1,36 @@
-"""Automatic import of ingestion plugins.
+"""On-demand import of ingestion plugins.
 
 Any module placed in this sub-package that defines a subclass of
-`ingestion.SourcePlugin` will be auto-registered at import time.  This file
-iterates over the children of the current package and imports them so the
-registration side-effects occur without any manual wiring.
+`ingestion.SourcePlugin` is auto-registered when it is imported.  Importing
+this package only records the sibling module paths (no plugin code runs);
+`load_plugins()` imports them, which `ingestion.get_plugins()` does the first
+time plugins are actually needed.  This keeps plugin dependencies out of
+processes that never run a plugin.
 """
 from importlib import import_module
 import pkgutil
+import threading
+from typing import Dict
 
-# Import all sibling modules (non-packages) to trigger `SourcePlugin` registry
-for mod_info in pkgutil.iter_modules(__path__):
-    if mod_info.ispkg:
-        # Nested packages can define their own auto-import logic.
-        continue
-    import_module(f"{__name__}.{mod_info.name}")
+# Module name -> dotted path of every sibling plugin module (non-packages;
+# nested packages can define their own loading logic)
+PLUGIN_MODULES: Dict[str, str] = {
+    mod_info.name: f"{__name__}.{mod_info.name}"
+    for mod_info in pkgutil.iter_modules(__path__)
+    if not mod_info.ispkg
+}
+
+_loaded = False
+_load_lock = threading.Lock()
+
+
+def load_plugins() -> None:
+    """Import all plugin modules once to trigger `SourcePlugin` registration."""
+    global _loaded
+    if _loaded:
+        return
+    with _load_lock:
+        if not _loaded:
+            for module_path in PLUGIN_MODULES.values():
+                import_module(module_path)
+            _loaded = True
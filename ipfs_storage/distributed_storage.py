@@ -5,21 +5,100 @@ are stored redundantly while waiting for IPFS confirmation.
 """
 
 import os
-import json
 import shutil
 import logging
 import time
+import orjson
 import redis
-import ipfshttpclient
-import hashlib
+import requests
+import heapq
+import itertools
 import random
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Union
 
+from blake3 import blake3
+from requests.adapters import HTTPAdapter
+
+from ipfs_storage.ipfs_client import get_client
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Read size for copy/hash loops
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Max commands queued per Redis pipeline round-trip in bulk sweeps
+REDIS_PIPELINE_CHUNK = 500
+
+# Files up to this size are read into memory once and the same bytes are
+# hashed, copied and sent to IPFS; larger files are streamed
+IPFS_ADD_BYTES_MAX = 16 * 1024 * 1024
+
+# Keep-alive connection pool used for peer-to-peer replication
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 64
+
+# Seconds a decoded copy of the storage-node registry stays valid
+NODES_CACHE_TTL = 5.0
+
+# Seconds a disk-usage reading is reused, and the change (GB) needed before
+# the node record is re-published
+USAGE_CACHE_TTL = 1.0
+USAGE_PUSH_THRESHOLD_GB = 0.1
+
+# Max seconds between node-record writes, so last_updated stays fresh even
+# when usage barely moves
+USAGE_HEARTBEAT_INTERVAL = 60.0
+
+# Internal file ids are BLAKE3 content hashes
+FILE_ID_PREFIX = "file_b3_"
+
+
+def _new_hasher():
+    """Return a fresh hasher for internal file ids."""
+    return blake3(max_threads=blake3.AUTO)
+
+
+def _drop_page_cache(path: Path) -> None:
+    """Ask the kernel to evict *path* from the page cache (no-op where unsupported)."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+# Per-thread reusable I/O buffer for the copy-and-hash loop
+_IO_BUF = threading.local()
+
+
+def _get_io_buffer() -> memoryview:
+    """Return this thread's COPY_CHUNK_SIZE buffer, allocating it on first use."""
+    view = getattr(_IO_BUF, "view", None)
+    if view is None:
+        view = _IO_BUF.view = memoryview(bytearray(COPY_CHUNK_SIZE))
+    return view
+
+
+def _weighted_sample(items: List, weights: List[float], k: int) -> List:
+    """Pick up to *k* distinct items, each with probability proportional to its weight.
+    
+    Efraimidis-Spirakis: keep the items with the largest ``u ** (1 / w)``.
+    """
+    keys = [(random.random() ** (1.0 / w), i) for i, w in enumerate(weights) if w > 0]
+    return [items[i] for _, i in heapq.nlargest(k, keys)]
+
+
 class DistributedStorage:
     def __init__(self, redis_url: str = "redis://localhost:6379/0", 
                  local_storage_path: str = "./temp_storage",
@@ -41,10 +120,29 @@ class DistributedStorage:
         self.replication_factor = replication_factor
         self.storage_nodes_key = storage_nodes_key
         self.capacity_gb = local_storage_capacity_gb
+        self.nodes_channel = f"{storage_nodes_key}:updates"
+        
+        # Decoded node registry: (monotonic timestamp, {node_id: node_info})
+        self._nodes_cache: Optional[Tuple[float, Dict[str, Dict]]] = None
+        self._candidates_cache: Optional[Tuple[Dict[str, Dict], List[Tuple[str, Dict, float]]]] = None
+        self._subscribe_node_updates()
+        
+        # Disk usage: (monotonic timestamp, used GB), plus the value last written
+        # to Redis and when it was written
+        self._usage_cache: Tuple[float, float] = (float("-inf"), 0.0)
+        self._last_pushed_usage: Optional[float] = None
+        self._last_pushed_at = float("-inf")
+        
+        # Persistent HTTP session so replica uploads reuse peer connections
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS,
+                              pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=0)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
         
         # Setup IPFS client
         try:
-            self.ipfs_client = ipfshttpclient.connect()
+            self.ipfs_client = get_client()
             logger.info("Connected to local IPFS daemon")
         except Exception as e:
             logger.warning(f"Could not connect to IPFS daemon: {e}")
@@ -56,20 +154,84 @@ class DistributedStorage:
     def _register_storage_node(self):
         """Register this node as a storage provider in Redis."""
         import socket
-        node_id = f"{socket.gethostname()}_{os.getpid()}"
+        self.node_id = f"{socket.gethostname()}_{os.getpid()}"
+        self.node_endpoint = self._get_node_endpoint()
         
-        node_info = {
+        node_info = self._node_info()
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hset(self.storage_nodes_key, self.node_id, orjson.dumps(node_info))
+        pipe.publish(self.nodes_channel, self.node_id)
+        pipe.execute()
+        self._last_pushed_usage = node_info["used_gb"]
+        self._last_pushed_at = time.monotonic()
+        self._nodes_cache = None
+        logger.info(f"Registered storage node {self.node_id}")
+        
+    def _subscribe_node_updates(self):
+        """Drop the cached node registry whenever any node (re)registers."""
+        def _invalidate(message):
+            self._nodes_cache = None
+            
+        try:
+            pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.nodes_channel: _invalidate})
+            self._nodes_listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        except Exception as e:
+            logger.warning(f"Node registry updates unavailable, relying on TTL: {e}")
+            self._nodes_listener = None
+            
+    def _get_nodes(self, max_age: float = NODES_CACHE_TTL) -> Dict[str, Dict]:
+        """Return the decoded storage-node registry, cached for *max_age* seconds."""
+        cached = self._nodes_cache
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+            
+        nodes = {}
+        for node_id, node_info_json in self.redis_client.hgetall(self.storage_nodes_key).items():
+            node_id = node_id.decode('utf-8') if isinstance(node_id, bytes) else node_id
+            try:
+                nodes[node_id] = orjson.loads(node_info_json)
+            except orjson.JSONDecodeError as e:
+                logger.error(f"Error parsing node info for {node_id}: {e}")
+        self._nodes_cache = (time.monotonic(), nodes)
+        return nodes
+        
+    def _replication_candidates(self) -> List[Tuple[str, Dict, float]]:
+        """Peers able to receive replicas as (node_id, node_info, free_gb).
+        
+        Sorted by free space, largest first, and rebuilt only when the
+        cached node registry is refreshed.
+        """
+        nodes = self._get_nodes()
+        cached = self._candidates_cache
+        if cached is not None and cached[0] is nodes:
+            return cached[1]
+            
+        candidates = []
+        for node_id, node_info in nodes.items():
+            if node_id == self.node_id:
+                continue
+                
+            try:
+                free_space = node_info["capacity_gb"] - node_info["used_gb"]
+                if free_space > 0 and node_info.get("endpoint"):
+                    candidates.append((node_id, node_info, free_space))
+            except (TypeError, KeyError) as e:
+                logger.error(f"Error parsing node info for {node_id}: {e}")
+        candidates.sort(key=lambda candidate: candidate[2], reverse=True)
+        self._candidates_cache = (nodes, candidates)
+        return candidates
+        
+    def _node_info(self) -> Dict:
+        """Current registry record for this node."""
+        return {
             "path": str(self.storage_path),
             "capacity_gb": self.capacity_gb,
             "used_gb": self._get_local_usage(),
             "last_updated": time.time(),
-            "endpoint": self._get_node_endpoint()
+            "endpoint": self.node_endpoint
         }
         
-        self.redis_client.hset(self.storage_nodes_key, node_id, json.dumps(node_info))
-        self.node_id = node_id
-        logger.info(f"Registered storage node {node_id}")
-        
     def _get_node_endpoint(self):
         """Get network endpoint for this node."""
         import socket
@@ -81,21 +243,37 @@ class DistributedStorage:
             return None
         
     def _get_local_usage(self):
-        """Get storage usage in GB."""
+        """Get storage usage in GB (cached for USAGE_CACHE_TTL seconds)."""
+        now = time.monotonic()
+        ts, used_gb = self._usage_cache
+        if now - ts < USAGE_CACHE_TTL:
+            return used_gb
         total, used, free = shutil.disk_usage(self.storage_path)
-        return used / (1024 * 1024 * 1024)  # Convert to GB
+        used_gb = used / (1024 * 1024 * 1024)  # Convert to GB
+        self._usage_cache = (now, used_gb)
+        return used_gb
         
-    def _update_usage(self):
-        """Update storage usage information in Redis."""
-        if not self.redis_client.hexists(self.storage_nodes_key, self.node_id):
-            self._register_storage_node()
-            return
-            
-        node_info = json.loads(self.redis_client.hget(self.storage_nodes_key, self.node_id))
-        node_info["used_gb"] = self._get_local_usage()
-        node_info["last_updated"] = time.time()
+    def _update_usage(self, pipe=None, force: bool = False):
+        """Update storage usage information in Redis.
         
-        self.redis_client.hset(self.storage_nodes_key, self.node_id, json.dumps(node_info))
+        Writes the full node record, so no read is needed first.  A small
+        usage change (USAGE_PUSH_THRESHOLD_GB or less) is not written unless
+        *force* is set, the last write is more than USAGE_HEARTBEAT_INTERVAL
+        seconds old, or the node is missing from the cached registry.  The
+        write re-registers the node in the last case.  Pass a pipeline as
+        *pipe* to queue the write instead of sending it immediately.
+        """
+        node_info = self._node_info()
+        now = time.monotonic()
+        if (not force and self._last_pushed_usage is not None
+                and abs(node_info["used_gb"] - self._last_pushed_usage) <= USAGE_PUSH_THRESHOLD_GB
+                and now - self._last_pushed_at < USAGE_HEARTBEAT_INTERVAL
+                and self.node_id in self._get_nodes()):
+            return
+        client = pipe if pipe is not None else self.redis_client
+        client.hset(self.storage_nodes_key, self.node_id, orjson.dumps(node_info))
+        self._last_pushed_usage = node_info["used_gb"]
+        self._last_pushed_at = now
         
     def store_file(self, file_path: Union[str, Path], metadata: Optional[Dict] = None, 
                    replicate: bool = True) -> Dict:
@@ -107,16 +285,62 @@ class DistributedStorage:
             replicate: Whether to replicate across nodes
             
         Returns:
-            Dict with storage information including file_id
+            Dict with storage information including file_id.  If identical
+            content is already stored on this node, its existing record is
+            returned as is; if it is stored only on other nodes (e.g. this
+            call is a replica upload), the local copy is kept and this node
+            is added to the existing record.
         """
         file_path = Path(file_path)
         if not file_path.exists():
             raise FileNotFoundError(f"File {file_path} not found")
+        file_stat = file_path.stat()
+            
+        # Copy into local storage and hash in the same pass, then move the
+        # copy to its content-addressed name once the hash is known
+        tmp_path = self.storage_path / f".tmp_{uuid.uuid4().hex}"
+        data = None
+        try:
+            if file_stat.st_size <= IPFS_ADD_BYTES_MAX:
+                data = file_path.read_bytes()
+                hasher = _new_hasher()
+                hasher.update(data)
+                file_hash = hasher.hexdigest()
+                tmp_path.write_bytes(data)
+            else:
+                file_hash = self._copy_and_hash(file_path, tmp_path)
+            file_id = f"{FILE_ID_PREFIX}{file_hash}"
             
-        # Calculate file hash as ID
-        file_hash = self._hash_file(file_path)
-        file_id = f"file_{file_hash}"
-        file_size = file_path.stat().st_size / (1024 * 1024 * 1024)  # Size in GB
+            # Identical content is already in the pool: skip IPFS add and
+            # replication, and keep the copy only if this node lacks one
+            existing = self.redis_client.hget("files", file_id)
+            if existing is not None:
+                existing = orjson.loads(existing)
+                if any(node["node_id"] == self.node_id for node in existing["storage_nodes"]):
+                    tmp_path.unlink()
+                    logger.info(f"{file_path.name} already stored as {file_id}")
+                    return existing
+                
+            shutil.copystat(file_path, tmp_path)
+            local_path = self.storage_path / file_id
+            os.replace(tmp_path, local_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        
+        if existing is not None:
+            # Add this node's copy to the record the other nodes share
+            existing["storage_nodes"].append({
+                "node_id": self.node_id,
+                "path": str(local_path)
+            })
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._update_usage(pipe)
+            pipe.hset("files", file_id, orjson.dumps(existing))
+            pipe.execute()
+            logger.info(f"Added local copy of {file_id}")
+            _drop_page_cache(local_path)
+            return existing
         
         # Prepare storage record
         if metadata is None:
@@ -125,7 +349,7 @@ class DistributedStorage:
         storage_info = {
             "file_id": file_id,
             "original_name": file_path.name,
-            "size_bytes": file_path.stat().st_size,
+            "size_bytes": file_stat.st_size,
             "created_at": time.time(),
             "metadata": metadata,
             "storage_nodes": [],
@@ -133,37 +357,40 @@ class DistributedStorage:
             "ipfs_hash": None
         }
         
-        # Store locally
-        local_path = self.storage_path / file_id
-        shutil.copy2(file_path, local_path)
         storage_info["storage_nodes"].append({
             "node_id": self.node_id,
             "path": str(local_path)
         })
         
-        # Update local storage usage
-        self._update_usage()
-        
-        # Store record in Redis
-        self.redis_client.hset("files", file_id, json.dumps(storage_info))
+        # Update local storage usage and store the record in one round-trip
+        pipe = self.redis_client.pipeline(transaction=False)
+        self._update_usage(pipe)
+        pipe.hset("files", file_id, orjson.dumps(storage_info))
+        pipe.execute()
         
         # If replication is requested, find other nodes and replicate
         if replicate and self.replication_factor > 1:
-            self._replicate_file(file_id, file_path, self.replication_factor - 1)
+            self._replicate_file(file_id, local_path, self.replication_factor - 1)
             
         # Attempt IPFS storage if client available
         if self.ipfs_client:
             try:
-                ipfs_hash = self.ipfs_client.add(str(local_path))["Hash"]
+                if data is not None:
+                    # Reuse the bytes already in memory instead of re-reading the copy
+                    ipfs_hash = self.ipfs_client.add_bytes(data)
+                else:
+                    ipfs_hash = self.ipfs_client.add(str(local_path))["Hash"]
                 storage_info["ipfs_hash"] = ipfs_hash
                 storage_info["ipfs_status"] = "stored"
-                self.redis_client.hset("files", file_id, json.dumps(storage_info))
+                self.redis_client.hset("files", file_id, orjson.dumps(storage_info))
                 logger.info(f"Stored {file_id} on IPFS with hash {ipfs_hash}")
             except Exception as e:
                 logger.error(f"Failed to store {file_id} on IPFS: {e}")
                 # Queue for later retry
                 self.redis_client.lpush("ipfs_retry_queue", file_id)
                 
+        # Done reading the local copy; don't let it crowd out hotter pages
+        _drop_page_cache(local_path)
         return storage_info
     
     def _replicate_file(self, file_id: str, local_file: Path, copies: int):
@@ -175,102 +402,131 @@ class DistributedStorage:
             copies: Number of additional copies to create
         """
         # Get all available storage nodes
-        all_nodes = self.redis_client.hgetall(self.storage_nodes_key)
-        if not all_nodes:
+        if not self._get_nodes():
             logger.warning(f"No storage nodes available for replication of {file_id}")
             return
             
-        # Filter out this node and nodes without enough space
+        # Peers with room for the file (list is sorted by free space, largest first)
         file_size_gb = local_file.stat().st_size / (1024 * 1024 * 1024)
-        candidate_nodes = []
-        
-        for node_id, node_info_json in all_nodes.items():
-            node_id = node_id.decode('utf-8') if isinstance(node_id, bytes) else node_id
-            if node_id == self.node_id:
-                continue
-                
-            node_info_json = node_info_json.decode('utf-8') if isinstance(node_info_json, bytes) else node_info_json
-                
-            try:
-                node_info = json.loads(node_info_json)
-                free_space = node_info["capacity_gb"] - node_info["used_gb"]
-                
-                if free_space >= file_size_gb and node_info.get("endpoint"):
-                    candidate_nodes.append((node_id, node_info))
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.error(f"Error parsing node info for {node_id}: {e}")
+        candidate_nodes = list(itertools.takewhile(
+            lambda candidate: candidate[2] >= file_size_gb, self._replication_candidates()
+        ))
                 
         if not candidate_nodes:
             logger.warning(f"No suitable nodes for replication of {file_id}")
             return
             
-        # Randomly select nodes for replication
-        selected_nodes = random.sample(candidate_nodes, min(copies, len(candidate_nodes)))
+        # Pick distinct nodes with probability proportional to free space
+        selected_nodes = _weighted_sample(
+            [(node_id, node_info) for node_id, node_info, _ in candidate_nodes],
+            [free for _, _, free in candidate_nodes],
+            copies,
+        )
         
-        # Get the current storage info
-        storage_info = json.loads(self.redis_client.hget("files", file_id))
-        
-        # Replicate to each selected node
-        import requests
-        for node_id, node_info in selected_nodes:
-            endpoint = node_info["endpoint"]
-            if not endpoint:
-                continue
+        # Replicate to all selected nodes concurrently
+        targets = [(node_id, node_info["endpoint"]) for node_id, node_info in selected_nodes]
+        with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+            replicas = list(pool.map(
+                lambda target: self._send_replica(file_id, local_file, *target), targets
+            ))
+        replicas = [replica for replica in replicas if replica]
+        if not replicas:
+            return
                 
-            try:
-                # Send file to the remote node
-                with open(local_file, 'rb') as f:
-                    response = requests.post(
-                        f"{endpoint}/store",
-                        files={'file': f},
-                        data={'file_id': file_id, 'replicate': 'false'},
-                        timeout=60
-                    )
-                    
-                if response.status_code == 200:
-                    result = response.json()
-                    storage_info["storage_nodes"].append({
-                        "node_id": node_id,
-                        "path": result.get("path")
-                    })
-                    logger.info(f"Replicated {file_id} to node {node_id}")
-                else:
-                    logger.error(f"Failed to replicate to {node_id}: {response.text}")
-            except Exception as e:
-                logger.error(f"Error replicating to {node_id}: {e}")
+        # Update storage record with all new replicas in one write; peers
+        # that already added themselves to the record are not listed twice
+        storage_info = orjson.loads(self.redis_client.hget("files", file_id))
+        known = {node["node_id"] for node in storage_info["storage_nodes"]}
+        storage_info["storage_nodes"].extend(
+            replica for replica in replicas if replica["node_id"] not in known)
+        self.redis_client.hset("files", file_id, orjson.dumps(storage_info))
+        
+    def _send_replica(self, file_id: str, local_file: Path, node_id: str, endpoint: str) -> Optional[Dict]:
+        """POST one replica to a remote node; return its storage_nodes entry or None.
+        
+        The file is streamed as the raw request body (no multipart framing);
+        the peer's ``/store`` route reads it from the stream.
+        """
+        try:
+            # Send file to the remote node
+            with open(local_file, 'rb') as f:
+                response = self._http.post(
+                    f"{endpoint}/store",
+                    data=f,
+                    headers={
+                        'Content-Type': 'application/octet-stream',
+                        'Content-Length': str(os.fstat(f.fileno()).st_size),
+                        'X-File-Id': file_id,
+                        'X-File-Name': local_file.name,
+                        'X-Replicate': 'false',
+                    },
+                    timeout=60
+                )
                 
-        # Update storage record with new replicas
-        self.redis_client.hset("files", file_id, json.dumps(storage_info))
+            if response.status_code == 200:
+                result = response.json()
+                logger.info(f"Replicated {file_id} to node {node_id}")
+                return {
+                    "node_id": node_id,
+                    "path": result.get("path")
+                }
+            logger.error(f"Failed to replicate to {node_id}: {response.text}")
+        except Exception as e:
+            logger.error(f"Error replicating to {node_id}: {e}")
+        return None
     
     def retry_ipfs_uploads(self, limit: int = 10):
-        """Retry uploading files to IPFS that failed earlier."""
-        for _ in range(limit):
-            file_id = self.redis_client.lpop("ipfs_retry_queue")
-            if not file_id:
-                break
-                
-            file_id = file_id.decode('utf-8') if isinstance(file_id, bytes) else file_id
-            storage_info = json.loads(self.redis_client.hget("files", file_id))
-            
-            # Check if we have a local copy
-            local_node = next((node for node in storage_info["storage_nodes"] 
-                              if node["node_id"] == self.node_id), None)
-                              
-            if not local_node or not self.ipfs_client:
-                # Put it back in the queue
-                self.redis_client.rpush("ipfs_retry_queue", file_id)
-                continue
-                
-            try:
-                ipfs_hash = self.ipfs_client.add(local_node["path"])["Hash"]
-                storage_info["ipfs_hash"] = ipfs_hash
-                storage_info["ipfs_status"] = "stored"
-                self.redis_client.hset("files", file_id, json.dumps(storage_info))
-                logger.info(f"Retry successful: stored {file_id} on IPFS with hash {ipfs_hash}")
-            except Exception as e:
-                logger.error(f"Retry failed for {file_id}: {e}")
-                # Put it back at the end of the queue
-                self.redis_client.rpush("ipfs_retry_queue", file_id)
+        """Retry uploading files to IPFS that failed earlier.
+        
+        Pops up to *limit* ids in one ``LPOP key count`` call, which needs
+        Redis 6.2 or newer.  Each id is handled on its own: files that still
+        cannot be uploaded go back on the queue, ids whose record is gone or
+        unreadable are dropped, and queued writes are sent even if an
+        unexpected error stops the batch.
+        """
+        file_ids = self.redis_client.lpop("ipfs_retry_queue", limit) or []
+        if not file_ids:
+            return
+        
+        pipe = self.redis_client.pipeline(transaction=False)
+        try:
+            for file_id in file_ids:
+                file_id = file_id.decode('utf-8') if isinstance(file_id, bytes) else file_id
+                try:
+                    storage_info_json = self.redis_client.hget("files", file_id)
+                    if storage_info_json is None:
+                        logger.warning(f"Dropping {file_id} from retry queue: no storage record")
+                        continue
+                    storage_info = orjson.loads(storage_info_json)
+                    
+                    # Check if we have a local copy
+                    local_node = next((node for node in storage_info["storage_nodes"] 
+                                      if node["node_id"] == self.node_id), None)
+                except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+                    logger.error(f"Dropping {file_id} from retry queue: bad storage record: {e}")
+                    continue
+                except Exception as e:
+                    logger.error(f"Retry failed for {file_id}: {e}")
+                    pipe.rpush("ipfs_retry_queue", file_id)
+                    continue
+                                  
+                if not local_node or not self.ipfs_client:
+                    # Put it back in the queue
+                    pipe.rpush("ipfs_retry_queue", file_id)
+                    continue
+                    
+                try:
+                    ipfs_hash = self.ipfs_client.add(local_node["path"])["Hash"]
+                    storage_info["ipfs_hash"] = ipfs_hash
+                    storage_info["ipfs_status"] = "stored"
+                    pipe.hset("files", file_id, orjson.dumps(storage_info))
+                    logger.info(f"Retry successful: stored {file_id} on IPFS with hash {ipfs_hash}")
+                except Exception as e:
+                    logger.error(f"Retry failed for {file_id}: {e}")
+                    # Put it back at the end of the queue
+                    pipe.rpush("ipfs_retry_queue", file_id)
+        finally:
+            pipe.execute()
     
     def get_file(self, file_id: str) -> Optional[Path]:
         """Get a file from the distributed storage pool.
@@ -284,7 +540,7 @@ class DistributedStorage:
         if not self.redis_client.hexists("files", file_id):
             return None
             
-        storage_info = json.loads(self.redis_client.hget("files", file_id))
+        storage_info = orjson.loads(self.redis_client.hget("files", file_id))
         
         # Check if we have a local copy
         local_node = next((node for node in storage_info["storage_nodes"] 
@@ -296,27 +552,21 @@ class DistributedStorage:
                 return local_path
                 
         # Try to get from another node
+        all_nodes = self._get_nodes()
         for node in storage_info["storage_nodes"]:
             if node["node_id"] == self.node_id:
                 continue
                 
             # Get node info to find its endpoint
-            node_info_json = self.redis_client.hget(self.storage_nodes_key, node["node_id"])
-            if not node_info_json:
+            node_info = all_nodes.get(node["node_id"])
+            if not isinstance(node_info, dict):
                 continue
                 
-            node_info_json = node_info_json.decode('utf-8') if isinstance(node_info_json, bytes) else node_info_json
-            
-            try:
-                node_info = json.loads(node_info_json)
-                endpoint = node_info.get("endpoint")
-                
-                if endpoint:
-                    local_path = self._fetch_from_remote_node(file_id, endpoint)
-                    if local_path:
-                        return local_path
-            except (json.JSONDecodeError, KeyError):
-                continue
+            endpoint = node_info.get("endpoint")
+            if endpoint:
+                local_path = self._fetch_from_remote_node(file_id, endpoint)
+                if local_path:
+                    return local_path
                 
         # If IPFS hash exists, try to get from IPFS
         ipfs_hash = storage_info.get("ipfs_hash")
@@ -336,7 +586,7 @@ class DistributedStorage:
                         "node_id": self.node_id,
                         "path": str(local_path)
                     })
-                    self.redis_client.hset("files", file_id, json.dumps(storage_info))
+                    self.redis_client.hset("files", file_id, orjson.dumps(storage_info))
                     return local_path
             except Exception as e:
                 logger.error(f"Failed to get {file_id} from IPFS: {e}")
@@ -353,9 +603,8 @@ class DistributedStorage:
         Returns:
             Path to the local copy if successful, None otherwise
         """
-        import requests
         try:
-            response = requests.get(
+            response = self._http.get(
                 f"{endpoint}/fetch/{file_id}",
                 stream=True,
                 timeout=60
@@ -364,31 +613,39 @@ class DistributedStorage:
             if response.status_code == 200:
                 local_path = self.storage_path / file_id
                 with open(local_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
+                    for chunk in response.iter_content(chunk_size=COPY_CHUNK_SIZE):
                         f.write(chunk)
                         
                 logger.info(f"Fetched {file_id} from remote node")
                 
                 # Update storage info to include this local copy
-                storage_info = json.loads(self.redis_client.hget("files", file_id))
+                storage_info = orjson.loads(self.redis_client.hget("files", file_id))
                 storage_info["storage_nodes"].append({
                     "node_id": self.node_id,
                     "path": str(local_path)
                 })
-                self.redis_client.hset("files", file_id, json.dumps(storage_info))
+                self.redis_client.hset("files", file_id, orjson.dumps(storage_info))
                 
+                _drop_page_cache(local_path)
                 return local_path
         except Exception as e:
             logger.error(f"Error fetching {file_id} from remote: {e}")
             
         return None
         
-    def _hash_file(self, file_path: Path) -> str:
-        """Calculate SHA-256 hash of a file."""
-        hasher = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+    def _copy_and_hash(self, src: Path, dst: Path) -> str:
+        """Copy *src* to *dst* and return its content hash, reading the source once."""
+        hasher = _new_hasher()
+        view = _get_io_buffer()
+        with open(src, 'rb', buffering=0) as fin, open(dst, 'wb', buffering=0) as fout:
+            while True:
+                n = fin.readinto(view)
+                if not n:
+                    break
+                chunk = view[:n]
                 hasher.update(chunk)
+                while chunk:
+                    chunk = chunk[fout.write(chunk):]
         return hasher.hexdigest()
         
     def cleanup_old_files(self, max_age_days: int = 30):
@@ -397,40 +654,49 @@ class DistributedStorage:
         Args:
             max_age_days: Maximum age of files to keep locally
         """
-        all_files = self.redis_client.hgetall("files")
-        for file_id, storage_info_json in all_files.items():
+        cutoff = time.time() - max_age_days * 24 * 3600
+        pipe = self.redis_client.pipeline(transaction=False)
+        pending = 0
+        cleaned = False
+        # Stream the registry instead of loading it all with HGETALL
+        for file_id, storage_info_json in self.redis_client.hscan_iter("files", count=1000):
             file_id = file_id.decode('utf-8') if isinstance(file_id, bytes) else file_id
-            storage_info_json = storage_info_json.decode('utf-8') if isinstance(storage_info_json, bytes) else storage_info_json
             
             try:
-                storage_info = json.loads(storage_info_json)
+                storage_info = orjson.loads(storage_info_json)
                 
                 # Skip files not successfully stored in IPFS
                 if storage_info.get("ipfs_status") != "stored" or not storage_info.get("ipfs_hash"):
                     continue
                     
                 # Check if file is old enough to delete
-                age_days = (time.time() - storage_info.get("created_at", 0)) / (24 * 3600)
-                if age_days < max_age_days:
+                if storage_info.get("created_at", 0) > cutoff:
                     continue
                     
-                # Check if we have a local copy
-                local_nodes = [node for node in storage_info["storage_nodes"] 
-                              if node["node_id"] == self.node_id]
-                              
-                for local_node in local_nodes:
-                    local_path = Path(local_node["path"])
+                # Delete local copies and drop this node from the list in one pass
+                remaining = []
+                for node in storage_info["storage_nodes"]:
+                    if node["node_id"] != self.node_id:
+                        remaining.append(node)
+                        continue
+                    local_path = Path(node["path"])
                     if local_path.exists():
                         local_path.unlink()
+                        cleaned = True
                         logger.info(f"Cleaned up old file {file_id}")
-                        
-                # Update storage info to remove this node
-                storage_info["storage_nodes"] = [node for node in storage_info["storage_nodes"] 
-                                               if node["node_id"] != self.node_id]
+                if len(remaining) == len(storage_info["storage_nodes"]):
+                    continue  # nothing stored on this node
+                storage_info["storage_nodes"] = remaining
                                                
-                self.redis_client.hset("files", file_id, json.dumps(storage_info))
-                
-                # Update local storage usage
-                self._update_usage()
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.error(f"Error processing file {file_id}: {e}") 
\ No newline at end of file
+                pipe.hset("files", file_id, orjson.dumps(storage_info))
+                pending += 1
+                if pending >= REDIS_PIPELINE_CHUNK:
+                    pipe.execute()
+                    pending = 0
+            except (orjson.JSONDecodeError, KeyError) as e:
+                logger.error(f"Error processing file {file_id}: {e}")
+        
+        # Update local storage usage once for the whole sweep
+        if cleaned:
+            self._update_usage(pipe)
+        pipe.execute()
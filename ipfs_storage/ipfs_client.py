@@ -1,38 +1,70 @@
 """Minimal IPFS helper that wraps ipfshttpclient and adds a
 `add_or_reuse` convenience to prevent duplicate uploads.
 """
+import hashlib
+import logging
+import mmap
+import os
+import threading
 from pathlib import Path
-from hashlib import sha256
 from typing import Union
 import ipfshttpclient
+import redis
 
 __all__ = ["get_client", "add_or_reuse"]
 
+logger = logging.getLogger(__name__)
+
+# Redis hash mapping file sha256 -> CID of content already added via add_or_reuse
+SHA256_TO_CID_KEY = "sha256_to_cid"
+
 _client = None
+_redis = None
+_init_lock = threading.Lock()
 
 
 def get_client(api_addr: str = None):
     """Return a cached ipfshttpclient instance."""
     global _client
     if _client is None:
-        _client = ipfshttpclient.connect(api_addr) if api_addr else ipfshttpclient.connect()
+        with _init_lock:  # callers may upload from several threads
+            if _client is None:
+                _client = ipfshttpclient.connect(api_addr) if api_addr else ipfshttpclient.connect()
     return _client
 
 
+def get_redis():
+    """Return a cached Redis client for the sha256 -> CID index."""
+    global _redis
+    if _redis is None:
+        with _init_lock:
+            if _redis is None:
+                _redis = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    return _redis
+
+
 def file_sha256(path: Union[str, Path]) -> str:
-    h = sha256()
-    p = Path(path)
-    with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    """Return the hex SHA-256 of *path*, hashed in C with the GIL released."""
+    with Path(path).open("rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        except ValueError:  # empty file cannot be mapped
+            pass
+        return h.hexdigest()
 
 
 def add_or_reuse(path: Union[str, Path], client=None) -> str:
     """Add file to IPFS if not already present; return CID.
 
-    This computes the file's sha256, asks the local node if a block with
-    identical multihash exists, and only uploads when missing.
+    Duplicates are detected through a Redis ``sha256 -> CID`` index, so the
+    check is a single lookup rather than a scan of every pin.  An indexed CID
+    is reused only while it is still pinned; otherwise the file is added
+    again.  If Redis is unreachable it falls back to scanning pin metadata,
+    and a failed index write is logged without failing the upload.
     """
     path = Path(path)
     if client is None:
@@ -40,13 +72,39 @@ def add_or_reuse(path: Union[str, Path], client=None) -> str:
 
     # quick check via file hash (not perfect but fast)
     file_hash = file_sha256(path)
-    pinned = client.pin.ls(type="recursive")
-    for cid, info in pinned.items():
-        if info.get("Metadata", {}).get("sha256") == file_hash:
-            return cid  # already pinned identical content
+    index = get_redis()
+    try:
+        cid = index.hget(SHA256_TO_CID_KEY, file_hash)
+    except redis.RedisError as e:
+        logger.warning(f"sha256 -> CID index unavailable, scanning pins: {e}")
+        index = None
+        pinned = client.pin.ls(type="recursive")
+        for cid, info in pinned.items():
+            if info.get("Metadata", {}).get("sha256") == file_hash:
+                return cid  # already pinned identical content
+    else:
+        if cid is not None:
+            cid = cid.decode() if isinstance(cid, bytes) else cid
+            if _is_pinned(client, cid):
+                return cid
+            logger.info(f"Indexed CID {cid} is no longer pinned, adding {path.name} again")
 
     res = client.add(path)
     cid = res["Hash"] if isinstance(res, dict) else res[-1]["Hash"]
     # Store sha256 as pin metadata for future lookups
     client.pin.add(cid, metadata={"sha256": file_hash})
+    if index is not None:
+        try:
+            index.hset(SHA256_TO_CID_KEY, file_hash, cid)
+        except redis.RedisError as e:
+            logger.warning(f"Could not index {cid} in sha256 -> CID index: {e}")
     return cid
+
+
+def _is_pinned(client, cid: str) -> bool:
+    """Return True if *cid* is still recursively pinned on the node."""
+    try:
+        client.pin.ls(cid, type="recursive")
+    except ipfshttpclient.exceptions.Error:
+        return False
+    return True
@@ -0,0 +1 @@
+# Test package for 757Built ipfs_storage module
@@ -0,0 +1,56 @@
+"""Unit tests for the distributed storage pool."""
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("blake3")
+pytest.importorskip("requests")
+pytest.importorskip("ipfshttpclient")
+
+import orjson
+import redis
+
+from ipfs_storage import distributed_storage
+
+
+@pytest.fixture
+def make_node(tmp_path, monkeypatch):
+    """Build DistributedStorage nodes that share one fake Redis server."""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis, "from_url", lambda url: fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(distributed_storage, "get_client", lambda: None)
+
+    def make(name):
+        monkeypatch.setattr("socket.gethostname", lambda: name)
+        return distributed_storage.DistributedStorage(
+            local_storage_path=str(tmp_path / name), replication_factor=1)
+
+    return make
+
+
+def test_same_content_stored_on_two_nodes(make_node, tmp_path):
+    source = tmp_path / "report.pdf"
+    source.write_bytes(b"same content")
+    node_a = make_node("host_a")
+    node_b = make_node("host_b")
+
+    first = node_a.store_file(source, replicate=False)
+    second = node_b.store_file(source, replicate=False)
+
+    assert second["file_id"] == first["file_id"]
+    record = orjson.loads(node_a.redis_client.hget("files", first["file_id"]))
+    paths = {node["node_id"]: node["path"] for node in record["storage_nodes"]}
+    assert set(paths) == {node_a.node_id, node_b.node_id}
+    for path in paths.values():
+        assert open(path, "rb").read() == b"same content"
+
+
+def test_store_again_on_same_node_keeps_one_entry(make_node, tmp_path):
+    source = tmp_path / "report.pdf"
+    source.write_bytes(b"same content")
+    node_a = make_node("host_a")
+
+    first = node_a.store_file(source, replicate=False)
+    again = node_a.store_file(source, replicate=False)
+
+    assert again == first
+    assert len(again["storage_nodes"]) == 1
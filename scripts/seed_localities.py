@@ -7,7 +7,11 @@ with region data.
 """
 import os
 import json
+import inspect
+from pathlib import Path
 import networkx as nx
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import ipfshttpclient
 import sys
@@ -22,20 +26,21 @@ from ipfs_storage.ipfs_client import add_or_reuse
 GRAPH_DATA_PATH = os.path.join('data', 'graph_data.json')
 GEOJSON_DIR = os.path.join('data', 'geojson')
 HAMPTON_ROADS_REGION_ID = "region_hampton_roads"
+IPFS_UPLOAD_WORKERS = 8
 
 # Hampton Roads localities
-HAMPTON_ROADS_LOCALITIES = [
+HAMPTON_ROADS_LOCALITIES = (
     "NORFOLK", "VIRGINIA BEACH", "CHESAPEAKE", "PORTSMOUTH", 
     "SUFFOLK", "HAMPTON", "NEWPORT NEWS", "WILLIAMSBURG",
     "JAMES CITY", "GLOUCESTER", "YORK", "POQUOSON",
     "ISLE OF WIGHT", "SURRY", "SOUTHAMPTON", "SMITHFIELD"
-]
+)
 
 # The Seven Cities (subset of Hampton Roads)
-SEVEN_CITIES = [
+SEVEN_CITIES = frozenset({
     "CHESAPEAKE", "HAMPTON", "NEWPORT NEWS", "NORFOLK", 
     "PORTSMOUTH", "SUFFOLK", "VIRGINIA BEACH"
-]
+})
 
 # Approximate centroid coordinates for localities (for visualization)
 LOCALITY_COORDINATES = {
@@ -57,55 +62,39 @@ LOCALITY_COORDINATES = {
     "SMITHFIELD": [36.9824, -76.6322]
 }
 
+# Key for the edge list in node-link JSON.  networkx >= 3.4 takes it as
+# ``edges=``; older releases call the argument ``link=``.
+_EDGES_KWARG = {
+    "edges" if "edges" in inspect.signature(nx.node_link_data).parameters else "link": "edges"
+}
+
 def normalize_locality_name(name):
     """Normalize a locality name to a consistent format for IDs."""
     return name.lower().replace(' ', '_')
 
+# Normalized name of every known locality, computed once
+NORMALIZED_LOCALITY_NAMES = {name: normalize_locality_name(name) for name in HAMPTON_ROADS_LOCALITIES}
+
+def _normalized(locality):
+    return NORMALIZED_LOCALITY_NAMES.get(locality) or normalize_locality_name(locality)
+
+# Sentinel: add_locality_to_graph should create and upload the GeoJSON itself
+_UPLOAD = object()
+
 def load_graph():
     """Load existing graph or create a new one."""
     if os.path.exists(GRAPH_DATA_PATH):
-        with open(GRAPH_DATA_PATH, 'r') as f:
-            graph_dict = json.load(f)
-        G = nx.DiGraph()
-        
-        # Add nodes
-        for node in graph_dict.get('nodes', []):
-            attrs = {k: v for k, v in node.items() if k != 'id'}
-            G.add_node(node['id'], **attrs)
-        
-        # Add edges
-        for edge in graph_dict.get('edges', []):
-            attrs = {k: v for k, v in edge.items() if k not in ['source', 'target']}
-            G.add_edge(edge['source'], edge['target'], **attrs)
-            
-        return G
+        data = orjson.loads(Path(GRAPH_DATA_PATH).read_bytes())
+        return nx.node_link_graph(data, directed=True, multigraph=False, **_EDGES_KWARG)
     else:
         return nx.DiGraph()
 
 def save_graph(G):
     """Save graph to JSON file."""
     os.makedirs(os.path.dirname(GRAPH_DATA_PATH), exist_ok=True)
-    
-    # Convert to dict format
-    nodes = []
-    for node_id, attrs in G.nodes(data=True):
-        node_data = {'id': node_id}
-        node_data.update(attrs)
-        nodes.append(node_data)
-    
-    edges = []
-    for u, v, attrs in G.edges(data=True):
-        edge_data = {'source': u, 'target': v}
-        edge_data.update(attrs)
-        edges.append(edge_data)
-    
-    graph_dict = {
-        'nodes': nodes,
-        'edges': edges
-    }
-    
-    with open(GRAPH_DATA_PATH, 'w') as f:
-        json.dump(graph_dict, f, indent=2)
+    Path(GRAPH_DATA_PATH).write_bytes(
+        orjson.dumps(nx.node_link_data(G, **_EDGES_KWARG), option=orjson.OPT_INDENT_2)
+    )
 
 def create_geojson_for_locality(locality, coordinates):
     """Create a simple GeoJSON Point feature for a locality."""
@@ -125,26 +114,34 @@ def create_geojson_for_locality(locality, coordinates):
     os.makedirs(GEOJSON_DIR, exist_ok=True)
     
     # Save to file
-    file_path = os.path.join(GEOJSON_DIR, f"{normalize_locality_name(locality)}.geojson")
+    file_path = os.path.join(GEOJSON_DIR, f"{_normalized(locality)}.geojson")
     with open(file_path, 'w') as f:
         json.dump(geojson, f, indent=2)
     
     return file_path
 
-def add_locality_to_graph(G, locality, coordinates, is_seven_cities=False):
-    """Add a locality node to the graph."""
-    locality_id = f"loc_{normalize_locality_name(locality)}"
-    
-    # Create GeoJSON file
-    geojson_path = create_geojson_for_locality(locality, coordinates)
-    
-    # Add to IPFS
-    geojson_cid = None
+def upload_geojson(locality, geojson_path):
+    """Add a locality's GeoJSON to IPFS; return its CID or None on failure."""
     try:
         geojson_cid = add_or_reuse(geojson_path)
         print(f"Added GeoJSON for {locality} to IPFS with CID: {geojson_cid}")
+        return geojson_cid
     except Exception as e:
         print(f"Warning: Could not add GeoJSON to IPFS: {e}")
+        return None
+
+def add_locality_to_graph(G, locality, coordinates, is_seven_cities=False, geojson_cid=_UPLOAD):
+    """Add a locality node to the graph.
+    
+    The GeoJSON is created and uploaded here unless *geojson_cid* is passed
+    (``None`` meaning the upload was attempted and failed).
+    """
+    locality_id = f"loc_{_normalized(locality)}"
+    
+    if geojson_cid is _UPLOAD:
+        # Create GeoJSON file and add to IPFS
+        geojson_path = create_geojson_for_locality(locality, coordinates)
+        geojson_cid = upload_geojson(locality, geojson_path)
     
     # Add node
     G.add_node(
@@ -184,13 +181,28 @@ def main():
     # Current timestamp
     now_iso = datetime.now().isoformat()
     
+    # Write every GeoJSON locally, then upload them concurrently
+    coordinates_by_locality = {
+        locality: LOCALITY_COORDINATES.get(locality, [0, 0]) for locality in HAMPTON_ROADS_LOCALITIES
+    }
+    geojson_paths = [
+        create_geojson_for_locality(locality, coordinates_by_locality[locality])
+        for locality in HAMPTON_ROADS_LOCALITIES
+    ]
+    with ThreadPoolExecutor(max_workers=IPFS_UPLOAD_WORKERS) as ex:
+        cids = dict(zip(
+            HAMPTON_ROADS_LOCALITIES,
+            ex.map(upload_geojson, HAMPTON_ROADS_LOCALITIES, geojson_paths),
+        ))
+    
     # Add localities
     for locality in HAMPTON_ROADS_LOCALITIES:
-        coordinates = LOCALITY_COORDINATES.get(locality, [0, 0])
         is_seven_cities = locality in SEVEN_CITIES
         
         # Add locality node
-        locality_id = add_locality_to_graph(G, locality, coordinates, is_seven_cities)
+        locality_id = add_locality_to_graph(
+            G, locality, coordinates_by_locality[locality], is_seven_cities, geojson_cid=cids[locality]
+        )
         
         # Connect to region
         G.add_edge(
@@ -4,27 +4,30 @@ Expose a simple API so other modules can call::
 
     from validation.validator import validate_record
 
-and get back a (possibly) modified record plus a list of issues.
+and get back a (possibly) modified record plus a sequence of issues.
 """
-from typing import Tuple, Dict, Any, List
+from typing import Tuple, Dict, Any, Sequence
 
 
 class ValidationIssue(str):
     """Marker subclass for future expansion (severity, code, etc.)."""
 
 
-def validate_record(record: Dict[str, Any]) -> Tuple[Dict[str, Any], List[ValidationIssue]]:
+# Shared result for records with nothing to report (avoids a list per call)
+_NO_ISSUES: Tuple[ValidationIssue, ...] = ()
+
+
+def validate_record(record: Dict[str, Any]) -> Tuple[Dict[str, Any], Sequence[ValidationIssue]]:
     """Placeholder that currently performs no changes.
 
-    Returns (possibly_modified_record, [issues]).  Initially just echoes
+    Returns (possibly_modified_record, issues).  Initially just echoes
     the input so that pipelines can integrate without altering
     behaviour.  Future versions can check required fields, look up
-    external sources, etc.
+    external sources, etc.  *issues* is an immutable empty tuple when
+    there is nothing to report; copy it before appending.
     """
-    issues: List[ValidationIssue] = []
-
     # Example: warn if no "funding" key
-    if "funding" not in record:
-        issues.append(ValidationIssue("missing_funding"))
+    if "funding" in record:
+        return record, _NO_ISSUES
 
-    return record, issues
+    return record, [ValidationIssue("missing_funding")]
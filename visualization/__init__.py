@@ -4,6 +4,13 @@ This package provides visualization tools like the Git-like
 project lineage graph.
 """
 
-from .git_graph import build_git_history_for_project, export_git_visualization
+from .git_graph import (
+    build_git_history_for_project,
+    build_git_history_with_localities,
+    export_all,
+    export_git_visualization,
+    export_git_visualization_bytes,
+)
 
-__all__ = ['build_git_history_for_project', 'export_git_visualization'] 
\ No newline at end of file
+__all__ = ['build_git_history_for_project', 'build_git_history_with_localities', 'export_all',
+           'export_git_visualization', 'export_git_visualization_bytes'] 
\ No newline at end of file
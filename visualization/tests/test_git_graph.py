@@ -0,0 +1,175 @@
+"""Unit tests for the Git-like project lineage export."""
+import pytest
+
+nx = pytest.importorskip("networkx")
+
+from graph_db.schema import EdgeType, NodeType
+from visualization.git_graph import (
+    build_git_history_for_project,
+    build_git_history_with_localities,
+    bulk_locality_info,
+    export_git_visualization,
+    get_node_locality_info,
+)
+
+
+@pytest.fixture
+def graph():
+    G = nx.DiGraph()
+    G.add_node("paper_a", type=NodeType.RESEARCH_PAPER.value, title="Paper A", date="2019-01-01")
+    G.add_node("paper_b", type=NodeType.RESEARCH_PAPER.value, title="Paper B", date="2019-06-01")
+    G.add_node("patent_x", type=NodeType.PATENT.value, title="Patent X", date="2020-01-01")
+    G.add_node("project_1", type=NodeType.PROJECT.value, title="Project 1", date="2021-01-01")
+    G.add_node("unrelated", type=NodeType.RESEARCH_PAPER.value, date="2018-01-01")
+    G.add_node("locality_norfolk", type=NodeType.LOCALITY.value, name="NORFOLK",
+               coordinates=(36.85, -76.29))
+    G.add_node("locality_york", type=NodeType.LOCALITY.value, name="YORK")
+
+    G.add_edge("paper_a", "patent_x", type=EdgeType.DERIVES_FROM.value)
+    G.add_edge("paper_b", "patent_x", type=EdgeType.DERIVES_FROM.value)
+    G.add_edge("patent_x", "project_1", type=EdgeType.IMPLEMENTS.value)
+    G.add_edge("paper_b", "project_1", type=EdgeType.INFLUENCED.value)
+    G.add_edge("unrelated", "project_1", type=EdgeType.CITED_BY.value)
+    G.add_edge("paper_a", "locality_york", type=EdgeType.LOCATED_IN.value, confidence=0.4)
+    G.add_edge("paper_a", "locality_norfolk", type=EdgeType.LOCATED_IN.value, confidence=0.9)
+    return G
+
+
+def test_history_follows_lineage_edges_only(graph):
+    commits = build_git_history_for_project(graph, "project_1")
+    ids = [c["id"] for c in commits]
+
+    assert sorted(ids) == ["paper_a", "paper_b", "patent_x", "project_1"]
+    # Ancestors always precede their descendants
+    position = {node: i for i, node in enumerate(ids)}
+    for commit in commits:
+        for parent in commit["parents"]:
+            assert position[parent] < position[commit["id"]]
+
+
+def test_history_order_matches_subgraph_toposort(graph):
+    """Commits follow networkx's topological order of the ancestor subgraph."""
+    ids = [c["id"] for c in build_git_history_for_project(graph, "project_1")]
+    assert ids == ["paper_b", "paper_a", "patent_x", "project_1"]
+
+
+def test_commit_parents_and_localities(graph):
+    commits = {c["id"]: c for c in build_git_history_for_project(graph, "project_1")}
+
+    assert sorted(commits["project_1"]["parents"]) == ["paper_b", "patent_x"]
+    assert sorted(commits["patent_x"]["parents"]) == ["paper_a", "paper_b"]
+    assert commits["paper_a"]["locality"] == "NORFOLK"
+    assert commits["paper_a"]["localities"] == ["NORFOLK", "YORK"]
+    assert commits["paper_a"]["coordinates"] == (36.85, -76.29)
+    assert commits["paper_a"]["in_seven_cities"] is True
+    assert commits["paper_b"]["locality"] == ""
+
+
+def test_export_groups_commits_and_branches(graph):
+    commits, commits_by_locality = build_git_history_with_localities(graph, "project_1")
+    data = export_git_visualization("project_1", commits, commits_by_locality)
+
+    assert commits == build_git_history_for_project(graph, "project_1")
+    assert data["localities"]["commits_by_locality"] == {"NORFOLK": ["paper_a"]}
+    # Without a grouping, plain lists/iterables of commits are grouped on the fly
+    assert export_git_visualization("project_1", iter(list(commits))) == data
+    branches = data["branches"]
+    assert branches["research"] == ["research/paper_a", "research/paper_b"]
+    assert branches["patent"] == ["patent/patent_x"]
+    assert branches["project"] == ["project/project_1"]
+    assert branches["branch_commits"]["research/paper_a"] == ["paper_a", "patent_x"]
+    assert branches["branch_commits"]["patent/patent_x"] == ["patent_x"]
+
+
+def test_add_localities_skips_embedded_nodes(graph):
+    from visualization.git_graph import add_localities_to_subgraph
+
+    graph.nodes["paper_b"]["primary_locality"] = "HAMPTON"
+    graph.add_edge("paper_b", "locality_york", type=EdgeType.LOCATED_IN.value)
+    subgraph = graph.subgraph(["paper_a", "paper_b"]).copy()
+
+    add_localities_to_subgraph(graph, subgraph)
+
+    assert set(subgraph.successors("paper_a")) == {"locality_norfolk", "locality_york"}
+    assert list(subgraph.successors("paper_b")) == []
+
+
+def test_bulk_locality_info_matches_scalar(graph):
+    graph.nodes["patent_x"]["primary_locality"] = "HAMPTON"
+    node_ids = ["paper_a", "paper_b", "patent_x", "project_1"]
+
+    bulk = bulk_locality_info(graph, node_ids)
+
+    assert bulk == {n: get_node_locality_info(graph, n) for n in node_ids}
+
+
+def test_lineage_cache_reused_until_lineage_changes(graph):
+    from graph_db.graph_builder import add_lineage_edge, bump_lineage_version
+    from visualization.git_graph import _cached_reverse_csr, _lineage_cache
+
+    build_git_history_for_project(graph, "project_1")
+    trace = _lineage_cache(graph)["traces"]["project_1"]
+    csr = _cached_reverse_csr(graph)
+    build_git_history_for_project(graph, "project_1")
+    assert _lineage_cache(graph)["traces"]["project_1"] is trace
+    assert _cached_reverse_csr(graph) is csr
+
+    add_lineage_edge(graph, "unrelated", "paper_a", EdgeType.INFLUENCED, "2018-06-01")
+    ids = {c["id"] for c in build_git_history_for_project(graph, "project_1")}
+    assert "unrelated" in ids
+    assert _cached_reverse_csr(graph) is not csr
+
+    graph.edges["unrelated", "paper_a"]["type"] = EdgeType.CITED_BY.value
+    bump_lineage_version(graph)
+    ids = {c["id"] for c in build_git_history_for_project(graph, "project_1")}
+    assert "unrelated" not in ids
+    # Only the version counter lands on the graph; copies start uncached
+    assert set(graph.graph) == {"lineage_version"}
+    assert "project_1" not in _lineage_cache(graph.copy())["traces"]
+
+
+def test_export_bytes_matches_dict(graph):
+    orjson = pytest.importorskip("orjson")
+    from visualization.git_graph import export_git_visualization_bytes
+
+    commits = build_git_history_for_project(graph, "project_1")
+    payload = orjson.loads(export_git_visualization_bytes("project_1", commits))
+
+    assert payload == orjson.loads(orjson.dumps(export_git_visualization("project_1", commits)))
+
+
+def test_export_all_matches_per_project_exports(graph, monkeypatch):
+    from visualization import git_graph
+    from visualization.git_graph import export_all
+
+    # Force the process pool for everything after the first project
+    monkeypatch.setattr(git_graph, "EXPORT_SAMPLE_PROJECTS", 1)
+    monkeypatch.setattr(git_graph, "EXPORT_POOL_STARTUP_SECONDS", -1.0)
+    graph.add_node("project_2", type=NodeType.PROJECT.value, date="2022-01-01")
+    graph.add_node("project_3", type=NodeType.PROJECT.value, date="2022-06-01")
+    graph.add_edge("patent_x", "project_3", type=EdgeType.IMPLEMENTS.value)
+    graph.add_edge("paper_a", "project_2", type=EdgeType.INFLUENCED.value)
+    project_ids = ["project_1", "project_2", "project_3"]
+
+    expected = [
+        export_git_visualization(p, build_git_history_for_project(graph, p))
+        for p in project_ids
+    ]
+
+    assert export_all(graph, project_ids, max_workers=2) == expected
+    assert export_all(graph, project_ids, max_workers=1) == expected
+    # No index is left behind on the graph to go stale
+    assert graph.graph == {}
+
+
+def test_export_all_small_batch_stays_in_process(graph, monkeypatch):
+    from visualization import git_graph
+
+    def no_pool(*args):
+        raise AssertionError("pool started for a small batch")
+
+    monkeypatch.setattr(git_graph, "_export_in_pool", no_pool)
+    monkeypatch.setattr(git_graph, "EXPORT_SAMPLE_PROJECTS", 1)
+    graph.add_node("project_2", type=NodeType.PROJECT.value, date="2022-01-01")
+    exports = git_graph.export_all(graph, ["project_1", "project_2"], max_workers=2)
+    assert [e["project_id"] for e in exports] == ["project_1", "project_2"]